@@ -1,8 +1,12 @@
+import functools
 import os
 import sys
+import threading
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import filedialog, messagebox
 from tkinter import ttk
+from typing import Optional
 
 try:
     from PIL import Image, ImageDraw, ImageFont, ImageTk
@@ -18,12 +22,200 @@ except Exception:  # pragma: no cover
     tb = None
 
 from label_qr_pdf import LabelRow, default_output_pdf, generate_labels_pdf, generate_qr_list_pdf
-from label_qr_pdf import read_labels_from_csv, read_labels_from_txt
-from label_qr_pdf import _make_qr_image_with_logo
+from label_qr_pdf import LineIndexedLabels, MappedTxtLabels, detect_encoding, read_labels_from_csv, read_labels_from_txt
+from label_qr_pdf import QrPlan, _make_qr_image_with_logo, _plan_qr_longest, plan_qr_batch, validate_labels
 
 
 _BaseWindow = tb.Window if tb is not None else tk.Tk
 
+_PREVIEW_CARDS = 6
+# Rendered thumbnails kept for paging back and forth (about 8 pages).
+_THUMB_CACHE_SIZE = 48
+
+
+@functools.lru_cache(maxsize=16)
+def _preview_font(size: int) -> "ImageFont.ImageFont":
+    try:
+        return ImageFont.truetype("arial.ttf", size=size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+def _truncate_to_width(draw: "ImageDraw.ImageDraw", text: str, font: "ImageFont.ImageFont", max_w: int) -> str:
+    t = (text or "").strip()
+    if not t:
+        return ""
+    if draw.textlength(t, font=font) <= max_w:
+        return t
+    while t and draw.textlength(t + "…", font=font) > max_w:
+        t = t[:-1]
+    return (t + "…") if t else ""
+
+
+def _wrap_ellipsis(
+    draw: "ImageDraw.ImageDraw",
+    text: str,
+    font: "ImageFont.ImageFont",
+    x: int,
+    y0: int,
+    max_w: int,
+    line_gap: int,
+    max_lines: int,
+) -> int:
+    s = (text or "").strip()
+    if not s or max_lines <= 0:
+        return y0
+    words = s.split()
+    if not words:
+        return y0
+
+    lines_out: list[str] = []
+    current = ""
+
+    def _push_line(line: str) -> None:
+        if line.strip():
+            lines_out.append(line.strip())
+
+    for w in words:
+        cand = (current + " " + w).strip()
+        if not current:
+            current = w
+            continue
+        if draw.textlength(cand, font=font) <= max_w:
+            current = cand
+        else:
+            _push_line(current)
+            current = w
+            if len(lines_out) >= max_lines:
+                current = ""
+                break
+
+    if current and len(lines_out) < max_lines:
+        _push_line(current)
+
+    overflow = False
+    if len(lines_out) > max_lines:
+        lines_out = lines_out[:max_lines]
+        overflow = True
+    elif len(lines_out) == max_lines:
+        # If there are still words left unrendered, mark overflow.
+        rendered = " ".join(lines_out).split()
+        overflow = len(rendered) < len(words)
+
+    if overflow and lines_out:
+        lines_out[-1] = _truncate_to_width(draw, lines_out[-1], font, max_w)
+
+    y = y0
+    for i, line in enumerate(lines_out[:max_lines]):
+        if i == max_lines - 1 and overflow:
+            line = _truncate_to_width(draw, line, font, max_w)
+        draw.text((x, y), line, fill=(0, 0, 0), font=font)
+        y += line_gap
+    return y
+
+
+def _make_label_preview(
+    row: LabelRow, target_w: int, target_h: int, logo: Optional[str], scale: float, plan: Optional[QrPlan] = None
+) -> "Image.Image":
+    label_w_mm = 80.0
+    label_h_mm = 50.0
+    qr_mm = 32.0
+    margin_mm = 5.0
+    qr_y_offset_mm = 6.0
+
+    w_px = max(220, int(target_w))
+    h_px = max(140, int(target_h))
+    img = Image.new("RGB", (w_px, h_px), (255, 255, 255))
+    dr = ImageDraw.Draw(img)
+
+    px_per_mm = w_px / label_w_mm
+    margin = int(margin_mm * px_per_mm)
+    qr_side = int(qr_mm * px_per_mm)
+    qr_side = max(int(18 * px_per_mm), min(qr_side, h_px - margin * 2))
+
+    qr_x = w_px - margin - qr_side
+    qr_y = int((margin_mm + qr_y_offset_mm) * px_per_mm)
+
+    qr_img = _make_qr_image_with_logo(
+        qr_text=row.qr_text,
+        box_size=6,
+        border=1,
+        logo_path=logo,
+        logo_scale=scale,
+        # The plan of the whole label set, so the preview shows the PDF's module grid.
+        plan=plan if plan is not None else plan_qr_batch(None, logo, scale),
+    ).resize((qr_side, qr_side))
+    img.paste(qr_img, (qr_x, qr_y))
+
+    text_x = margin
+    text_max_w = max(10, (qr_x - margin) - text_x)
+
+    f1 = _preview_font(max(14, int(h_px * 0.12)))
+    f2 = _preview_font(max(12, int(h_px * 0.10)))
+    f3 = _preview_font(max(10, int(h_px * 0.085)))
+
+    text_y_top_mm = label_h_mm - margin_mm - 2.8
+    y_top_px = int((label_h_mm - text_y_top_mm) * px_per_mm)
+    dr.text((text_x, y_top_px), (row.cins or "").strip(), fill=(0, 0, 0), font=f1)
+
+    name_y_mm = text_y_top_mm - 5.6
+    name_y_px = int((label_h_mm - name_y_mm) * px_per_mm)
+    _wrap_ellipsis(dr, (row.carpet_name or "").strip().upper(), f2, text_x, name_y_px, text_max_w, int(4.4 * px_per_mm), 3)
+
+    bottom_y_mm = margin_mm + 3.5
+    bottom_y_px = int((label_h_mm - bottom_y_mm) * px_per_mm)
+    _wrap_ellipsis(dr, (row.qr_text or "").strip(), f3, text_x, bottom_y_px, text_max_w, int(3.2 * px_per_mm), 1)
+
+    dr.rectangle([0, 0, w_px - 1, h_px - 1], outline=(140, 140, 140), width=1)
+    return img
+
+
+class _TextEditTracker:
+    # Sits in front of a Text widget's Tcl command (the same trick as idlelib's Percolator)
+    # and reports the line range every insert/delete/replace touched:
+    # on_edit((first_line, old_line_count, new_lines)) with 0-based lines, or
+    # on_edit(None) when the change cannot be located (undo/redo) and a full resync is needed.
+
+    def __init__(self, widget: tk.Text, on_edit) -> None:
+        self._widget = widget
+        self._on_edit = on_edit
+        self._orig = widget._w + "_orig"
+        widget.tk.call("rename", widget._w, self._orig)
+        widget.tk.createcommand(widget._w, self._dispatch)
+
+    def _call(self, *args):
+        return self._widget.tk.call((self._orig,) + args)
+
+    def _line(self, index) -> int:
+        return int(str(self._call("index", index)).split(".")[0])
+
+    def _dispatch(self, *args):
+        op = args[0] if args else ""
+        if op == "insert":
+            indices = args[1:2]
+        elif op == "delete":
+            # A single index deletes one character, possibly the newline joining the next line.
+            indices = args[1:] + ((args[-1] + " +1c",) if len(args) % 2 == 0 else ())
+        elif op == "replace":
+            indices = args[1:3]
+        else:
+            result = self._call(*args)
+            if op == "edit" and len(args) > 1 and args[1] in ("undo", "redo"):
+                self._on_edit(None)
+            return result
+
+        lines = [self._line(i) for i in indices]
+        before = self._line("end-1c")
+        result = self._call(*args)
+        after = self._line("end-1c")
+        # "end" resolves one line past the last one.
+        first = min(min(lines), before)
+        last = min(max(lines), before)
+        new_last = last + after - before
+        text = str(self._call("get", f"{first}.0", f"{new_last}.end"))
+        self._on_edit((first - 1, last - first + 1, text.split("\n")))
+        return result
+
 
 class App(_BaseWindow):
     def __init__(self) -> None:
@@ -49,15 +241,29 @@ class App(_BaseWindow):
         self.output_path = tk.StringVar(value="")
         self.width_mm = tk.StringVar(value="80")
         self.height_mm = tk.StringVar(value="50")
-        self.encoding = tk.StringVar(value="utf-8")
+        self.encoding = tk.StringVar(value="auto")
         self.logo_path = tk.StringVar(value="")
         self.logo_scale = tk.StringVar(value="22")
         self.list_cols = tk.StringVar(value="4")
         self.list_rows = tk.StringVar(value="12")
+        self.compact_images = tk.BooleanVar(value=False)
 
         self._labels: list[LabelRow] = []
+        self._manual_rows = LineIndexedLabels()
+        self._manual_refresh_pending = False
         self._preview_imgs: list[ImageTk.PhotoImage] = []
         self._preview_h: int = 170
+        self._preview_page: int = 0
+        self._thumbs: "OrderedDict[int, Image.Image]" = OrderedDict()
+        self._thumb_lock = threading.Lock()
+        self._thumb_gen: int = 0
+        self._thumb_settings: tuple = ()
+        # QR plan for the current labels and logo settings; computed when first previewed.
+        self._preview_plan: Optional[QrPlan] = None
+        # Longest qr_text (UTF-8 bytes) of the shown manual rows; None for file input.
+        self._labels_longest: Optional[int] = None
+        self._preview_scale_busy = False
+        self.preview_jump = tk.StringVar(value="")
 
         root = ttk.Frame(self, padding=0)
         root.pack(fill=tk.BOTH, expand=True)
@@ -262,8 +468,9 @@ class App(_BaseWindow):
         else:
             ttk.Button(row2, text="Seç", command=self._pick_csv).pack(side=tk.LEFT)
 
-        tabs.bind("<<NotebookTabChanged>>", lambda _e: self._refresh_labels())
-        self.manual_text.bind("<KeyRelease>", lambda _e: self._refresh_labels())
+        tabs.bind("<<NotebookTabChanged>>", lambda _e: self._refresh_labels(reset_page=True))
+        # Edits are parsed line by line as they happen; the preview is refreshed once per idle.
+        _TextEditTracker(self.manual_text, self._on_manual_edit)
 
     def _build_settings(self, parent: ttk.Frame) -> None:
         box = ttk.LabelFrame(parent, text="Ayarlar", padding=10)
@@ -288,6 +495,7 @@ class App(_BaseWindow):
         enc.grid(row=2, column=0, columnspan=3, sticky="we", pady=(10, 0))
         ttk.Label(enc, text="Encoding:").pack(side=tk.LEFT)
         ttk.Entry(enc, textvariable=self.encoding, width=12).pack(side=tk.LEFT, padx=(8, 0))
+        ttk.Label(enc, text="(auto: otomatik tespit)", foreground="#666").pack(side=tk.LEFT, padx=(10, 0))
 
         logo = ttk.Frame(box)
         logo.grid(row=3, column=0, columnspan=3, sticky="we", pady=(10, 0))
@@ -306,6 +514,7 @@ class App(_BaseWindow):
         ttk.Label(logo2, text="Logo Boyutu (%):").pack(side=tk.LEFT)
         ttk.Entry(logo2, textvariable=self.logo_scale, width=6).pack(side=tk.LEFT, padx=(8, 0))
         ttk.Label(logo2, text="(öneri: 18-26)", foreground="#666").pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Checkbutton(logo2, text="Kompakt QR (1-bit, küçük PDF)", variable=self.compact_images).pack(side=tk.RIGHT)
 
         grid_cfg = ttk.Frame(box)
         grid_cfg.grid(row=5, column=0, columnspan=3, sticky="we", pady=(10, 0))
@@ -346,7 +555,7 @@ class App(_BaseWindow):
         self._render_preview()
 
     def _build_preview(self, parent: ttk.Frame) -> None:
-        box = ttk.LabelFrame(parent, text="Önizleme (ilk 6 kayıt)", padding=10)
+        box = ttk.LabelFrame(parent, text="Önizleme", padding=10)
         box.grid(row=0, column=0, sticky="nsew")
         box.rowconfigure(0, weight=1)
         box.columnconfigure(0, weight=1)
@@ -360,13 +569,46 @@ class App(_BaseWindow):
         self.preview.rowconfigure(2, weight=1)
 
         self.preview_cards: list[ttk.Label] = []
-        for idx in range(6):
+        for idx in range(_PREVIEW_CARDS):
             r = idx // 2
             c = idx % 2
             card = ttk.Label(self.preview, text="", anchor="center", relief="groove")
             card.grid(row=r, column=c, sticky="nsew", padx=6, pady=6, ipadx=6, ipady=6)
             self.preview_cards.append(card)
 
+        nav = ttk.Frame(box)
+        nav.grid(row=1, column=0, sticky="we", pady=(8, 0))
+        nav.columnconfigure(2, weight=1)
+        ttk.Button(nav, text="◀", width=3, command=lambda: self._go_preview_page(self._preview_page - 1)).grid(
+            row=0, column=0
+        )
+        ttk.Button(nav, text="▶", width=3, command=lambda: self._go_preview_page(self._preview_page + 1)).grid(
+            row=0, column=1, padx=(4, 8)
+        )
+
+        def _on_scale(value: str) -> None:
+            if not self._preview_scale_busy:
+                self._go_preview_page(int(float(value)))
+
+        self.preview_scale = ttk.Scale(nav, from_=0, to=1, orient=tk.HORIZONTAL, command=_on_scale)
+        self.preview_scale.grid(row=0, column=2, sticky="we")
+        self.lbl_preview_pos = ttk.Label(nav, text="0 / 0", foreground="#666", width=18, anchor="e")
+        self.lbl_preview_pos.grid(row=0, column=3, padx=(8, 0))
+        ttk.Label(nav, text="Satır:").grid(row=0, column=4, padx=(12, 0))
+        jump = ttk.Entry(nav, textvariable=self.preview_jump, width=8)
+        jump.grid(row=0, column=5, padx=(6, 0))
+        jump.bind("<Return>", lambda _e: self._jump_preview_row())
+        ttk.Button(nav, text="Git", width=4, command=self._jump_preview_row).grid(row=0, column=6, padx=(6, 0))
+
+        def _on_wheel(e) -> None:
+            step = -1 if (getattr(e, "delta", 0) > 0 or getattr(e, "num", 0) == 4) else 1
+            self._go_preview_page(self._preview_page + step)
+
+        for widget in [self.preview] + self.preview_cards:
+            widget.bind("<MouseWheel>", _on_wheel)
+            widget.bind("<Button-4>", _on_wheel)
+            widget.bind("<Button-5>", _on_wheel)
+
         def _on_preview_resize(e):
             try:
                 w = max(10, int(e.width))
@@ -393,7 +635,7 @@ class App(_BaseWindow):
         self.txt_path.set(p)
         if not self.output_path.get().strip():
             self.output_path.set(default_output_pdf(p))
-        self._refresh_labels()
+        self._refresh_labels(reset_page=True)
 
     def _pick_csv(self) -> None:
         p = filedialog.askopenfilename(filetypes=[("CSV", "*.csv"), ("All", "*.*")])
@@ -402,7 +644,7 @@ class App(_BaseWindow):
         self.csv_path.set(p)
         if not self.output_path.get().strip():
             self.output_path.set(default_output_pdf(p))
-        self._refresh_labels()
+        self._refresh_labels(reset_page=True)
 
     def _pick_output(self) -> None:
         p = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF", "*.pdf")])
@@ -418,198 +660,257 @@ class App(_BaseWindow):
             return "txt"
         return "csv"
 
-    def _refresh_labels(self) -> None:
+    def _set_labels(self, labels) -> None:
+        old = self._labels
+        self._labels = labels
+        self._labels_longest = None
+        self._reset_thumbs()
+        if old is not labels and hasattr(old, "close"):
+            old.close()
+
+    def _show_manual_rows(self) -> None:
+        # After an edit only the touched rows lose their thumbnails, and the QR plan is kept
+        # unless the longest text moves it to another version.
+        edits = self._manual_rows.take_edits()
+        longest = self._manual_rows.longest_qr_bytes
+        if edits is None or self._labels_longest is None:
+            self._set_labels(self._manual_rows.rows())
+            self._labels_longest = longest
+            return
+        self._labels = self._manual_rows.rows()
+        self._labels_longest = longest
+        plan = self._preview_plan
+        if plan is not None and self._thumb_settings:
+            _w, _h, logo, scale = self._thumb_settings
+            if _plan_qr_longest(longest, logo, scale) != plan:
+                self._reset_thumbs()
+                return
+        self._edit_thumbs(edits)
+
+    def _on_manual_edit(self, change) -> None:
+        if change is None:
+            self._manual_rows.set_text(self.manual_text.get("1.0", "end-1c"))
+        else:
+            self._manual_rows.replace_lines(*change)
+        if not self._manual_refresh_pending:
+            self._manual_refresh_pending = True
+            self.after_idle(self._manual_edited)
+
+    def _manual_edited(self) -> None:
+        self._manual_refresh_pending = False
+        if self._current_input_mode() == "manual":
+            self._refresh_labels()
+
+    def _refresh_labels(self, reset_page: bool = False) -> None:
+        if reset_page:
+            self._preview_page = 0
         try:
             mode = self._current_input_mode()
-            enc = self.encoding.get().strip() or "utf-8"
+            enc = self.encoding.get().strip() or "auto"
+            status_enc = ""
+            status_copies = ""
             if mode == "manual":
-                raw = self.manual_text.get("1.0", "end").splitlines()
-                lines = [ln.strip() for ln in raw if ln.strip()]
-                tmp_path = None
-                self._labels = []
-                for ln in lines:
-                    if ":" not in ln:
-                        continue
-                    cins, rest = ln.split(":", 1)
-                    cins = cins.strip()
-                    rest = rest.strip()
-                    carpet_name = rest.replace("-", " ")
-                    self._labels.append(LabelRow(cins=cins, carpet_name=carpet_name, qr_text=ln))
-            elif mode == "txt":
-                p = self.txt_path.get().strip()
-                self._labels = read_labels_from_txt(p, encoding=enc) if p and os.path.exists(p) else []
+                self._show_manual_rows()
             else:
-                p = self.csv_path.get().strip()
-                self._labels = read_labels_from_csv(p, encoding=enc) if p and os.path.exists(p) else []
+                p = self.txt_path.get().strip() if mode == "txt" else self.csv_path.get().strip()
+                if p and os.path.exists(p):
+                    if enc.lower() == "auto":
+                        enc = detect_encoding(p)
+                        status_enc = f" ({enc})"
+                    if mode == "txt":
+                        # Offset index over the mapped file: rows are decoded only when shown,
+                        # so any row of a huge file can be previewed immediately.
+                        try:
+                            self._set_labels(MappedTxtLabels(p, encoding=enc))
+                        except ValueError:
+                            self._set_labels(read_labels_from_txt(p, encoding=enc))
+                    else:
+                        self._set_labels(read_labels_from_csv(p, encoding=enc))
+                        report = validate_labels(self._labels, *self._logo_settings())
+                        if report.labels != report.rows:
+                            status_copies = f", {report.labels} etiket"
+                        problems = report.errors + report.warnings
+                        if problems:
+                            status_copies += " — " + problems[0]
+                else:
+                    self._set_labels([])
 
-            self.lbl_status.config(text=f"{len(self._labels)} kayıt")
+            self.lbl_status.config(text=f"{len(self._labels)} kayıt{status_copies}{status_enc}")
             self._render_preview()
         except Exception as e:
-            self._labels = []
+            self._set_labels([])
             self.lbl_status.config(text="0 kayıt")
             self._render_preview(clear=True)
 
+    def _logo_settings(self) -> tuple:
+        logo = self.logo_path.get().strip() or None
+        try:
+            logo_scale = float((self.logo_scale.get().strip() or "22")) / 100.0
+        except ValueError:
+            logo_scale = 0.22
+        return logo, logo_scale
+
+    def _preflight(self, labels, logo: Optional[str], logo_scale: float) -> bool:
+        # Checks every row before any QR is encoded; errors stop, warnings ask.
+        report = validate_labels(labels, logo, logo_scale)
+        problems = report.errors + report.warnings
+        status = f"{report.rows} kayıt, {report.labels} etiket"
+        self.lbl_status.config(text=status + (" — " + problems[0] if problems else ""))
+        if not report.ok:
+            messagebox.showerror("Hata", report.summary())
+            return False
+        if report.warnings:
+            return messagebox.askyesno("Uyarı", report.summary() + "\n\nYine de devam edilsin mi?")
+        return True
+
+    def _preview_settings(self) -> tuple:
+        h = max(120, int(self._preview_h))
+        w = max(190, int(h * 80 / 50))
+        logo = self.logo_path.get().strip() or None
+        try:
+            scale = float((self.logo_scale.get().strip() or "22")) / 100.0
+        except ValueError:
+            scale = 0.22
+        return (w, h, logo, scale)
+
+    def _reset_thumbs(self) -> None:
+        with self._thumb_lock:
+            self._thumb_gen += 1
+            self._thumbs.clear()
+            self._preview_plan = None
+
+    def _edit_thumbs(self, edits) -> None:
+        # Thumbnails above an edited range stay, those below it move with their rows. The
+        # generation still changes, so a prefetch of the old row list cannot store anything.
+        with self._thumb_lock:
+            self._thumb_gen += 1
+            thumbs = self._thumbs
+            for start, old_count, new_count in edits:
+                moved: "OrderedDict[int, Image.Image]" = OrderedDict()
+                for idx, img in thumbs.items():
+                    if idx < start:
+                        moved[idx] = img
+                    elif idx >= start + old_count:
+                        moved[idx - old_count + new_count] = img
+                thumbs = moved
+            self._thumbs = thumbs
+
+    def _thumb_get(self, idx: int) -> Optional["Image.Image"]:
+        with self._thumb_lock:
+            img = self._thumbs.get(idx)
+            if img is not None:
+                self._thumbs.move_to_end(idx)
+            return img
+
+    def _thumb_put(self, gen: int, idx: int, img: "Image.Image") -> None:
+        with self._thumb_lock:
+            if gen != self._thumb_gen:
+                return
+            self._thumbs[idx] = img
+            self._thumbs.move_to_end(idx)
+            while len(self._thumbs) > _THUMB_CACHE_SIZE:
+                self._thumbs.popitem(last=False)
+
+    def _prefetch(self, start: int) -> None:
+        # Render the next page in the background; only PIL work happens off the Tk thread.
+        labels = self._labels
+        end = min(start + _PREVIEW_CARDS, len(labels))
+        with self._thumb_lock:
+            todo = [i for i in range(start, end) if i not in self._thumbs]
+            gen = self._thumb_gen
+        if not todo:
+            return
+        w, h, logo, scale = self._thumb_settings
+        plan = self._preview_plan
+
+        def work() -> None:
+            try:
+                for i in todo:
+                    if gen != self._thumb_gen:
+                        return
+                    self._thumb_put(gen, i, _make_label_preview(labels[i], w, h, logo, scale, plan))
+            except Exception:
+                pass
+
+        threading.Thread(target=work, daemon=True).start()
+
     def _render_preview(self, clear: bool = False) -> None:
         if ImageTk is None:
             for card in self.preview_cards:
                 card.config(text="Önizleme için Pillow gerekli", image="")
             return
         self._preview_imgs = []
-        if clear or not self._labels:
+        total = 0 if clear else len(self._labels)
+        if not total:
             for card in self.preview_cards:
                 card.config(text="", image="")
+            self._update_preview_nav(0)
             return
 
-        def _truncate_to_width(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_w: int) -> str:
-            t = (text or "").strip()
-            if not t:
-                return ""
-            if draw.textlength(t, font=font) <= max_w:
-                return t
-            while t and draw.textlength(t + "…", font=font) > max_w:
-                t = t[:-1]
-            return (t + "…") if t else ""
-
-        def _wrap_ellipsis(
-            draw: ImageDraw.ImageDraw,
-            text: str,
-            font: ImageFont.ImageFont,
-            x: int,
-            y0: int,
-            max_w: int,
-            line_gap: int,
-            max_lines: int,
-        ) -> int:
-            s = (text or "").strip()
-            if not s or max_lines <= 0:
-                return y0
-            words = s.split()
-            if not words:
-                return y0
-
-            lines_out: list[str] = []
-            current = ""
-
-            def _push_line(line: str) -> None:
-                if line.strip():
-                    lines_out.append(line.strip())
-
-            for w in words:
-                cand = (current + " " + w).strip()
-                if not current:
-                    current = w
-                    continue
-                if draw.textlength(cand, font=font) <= max_w:
-                    current = cand
-                else:
-                    _push_line(current)
-                    current = w
-                    if len(lines_out) >= max_lines:
-                        current = ""
-                        break
-
-            if current and len(lines_out) < max_lines:
-                _push_line(current)
-
-            overflow = False
-            if len(lines_out) > max_lines:
-                lines_out = lines_out[:max_lines]
-                overflow = True
-            elif len(lines_out) == max_lines:
-                # If there are still words left unrendered, mark overflow.
-                rendered = " ".join(lines_out).split()
-                overflow = len(rendered) < len(words)
-
-            if overflow and lines_out:
-                lines_out[-1] = _truncate_to_width(draw, lines_out[-1], font, max_w)
-
-            y = y0
-            for i, line in enumerate(lines_out[:max_lines]):
-                if i == max_lines - 1 and overflow:
-                    line = _truncate_to_width(draw, line, font, max_w)
-                draw.text((x, y), line, fill=(0, 0, 0), font=font)
-                y += line_gap
-            return y
-
-        def _make_label_preview(row: LabelRow, target_w: int, target_h: int) -> Image.Image:
-            label_w_mm = 80.0
-            label_h_mm = 50.0
-            qr_mm = 32.0
-            margin_mm = 5.0
-            qr_y_offset_mm = 6.0
-
-            w_px = max(220, int(target_w))
-            h_px = max(140, int(target_h))
-            img = Image.new("RGB", (w_px, h_px), (255, 255, 255))
-            dr = ImageDraw.Draw(img)
-
-            px_per_mm = w_px / label_w_mm
-            margin = int(margin_mm * px_per_mm)
-            qr_side = int(qr_mm * px_per_mm)
-            qr_side = max(int(18 * px_per_mm), min(qr_side, h_px - margin * 2))
-
-            qr_x = w_px - margin - qr_side
-            qr_y = int((margin_mm + qr_y_offset_mm) * px_per_mm)
-
-            logo = self.logo_path.get().strip() or None
-            try:
-                scale = float((self.logo_scale.get().strip() or "22")) / 100.0
-            except ValueError:
-                scale = 0.22
-
-            qr_img = _make_qr_image_with_logo(
-                qr_text=row.qr_text,
-                box_size=6,
-                border=1,
-                logo_path=logo,
-                logo_scale=scale,
-            ).resize((qr_side, qr_side))
-            img.paste(qr_img, (qr_x, qr_y))
-
-            text_x = margin
-            text_max_w = max(10, (qr_x - margin) - text_x)
-
-            try:
-                f1 = ImageFont.truetype("arial.ttf", size=max(14, int(h_px * 0.12)))
-                f2 = ImageFont.truetype("arial.ttf", size=max(12, int(h_px * 0.10)))
-                f3 = ImageFont.truetype("arial.ttf", size=max(10, int(h_px * 0.085)))
-            except Exception:
-                f1 = ImageFont.load_default()
-                f2 = ImageFont.load_default()
-                f3 = ImageFont.load_default()
-
-            text_y_top_mm = label_h_mm - margin_mm - 2.8
-            y_top_px = int((label_h_mm - text_y_top_mm) * px_per_mm)
-            dr.text((text_x, y_top_px), (row.cins or "").strip(), fill=(0, 0, 0), font=f1)
-
-            name_y_mm = text_y_top_mm - 5.6
-            name_y_px = int((label_h_mm - name_y_mm) * px_per_mm)
-            _wrap_ellipsis(dr, (row.carpet_name or "").strip().upper(), f2, text_x, name_y_px, text_max_w, int(4.4 * px_per_mm), 3)
-
-            bottom_y_mm = margin_mm + 3.5
-            bottom_y_px = int((label_h_mm - bottom_y_mm) * px_per_mm)
-            _wrap_ellipsis(dr, (row.qr_text or "").strip(), f3, text_x, bottom_y_px, text_max_w, int(3.2 * px_per_mm), 1)
-
-            dr.rectangle([0, 0, w_px - 1, h_px - 1], outline=(140, 140, 140), width=1)
-            return img
-
-        ratio = 80 / 50
-        sample = self._labels[:6]
-        for i in range(6):
+        settings = self._preview_settings()
+        if settings != self._thumb_settings:
+            self._reset_thumbs()
+            self._thumb_settings = settings
+        w, h, logo, scale = settings
+        if self._preview_plan is None:
+            if self._labels_longest is not None:
+                self._preview_plan = _plan_qr_longest(self._labels_longest, logo, scale)
+            else:
+                self._preview_plan = plan_qr_batch((r.qr_text for r in self._labels), logo, scale)
+        plan = self._preview_plan
+
+        last_page = (total - 1) // _PREVIEW_CARDS
+        self._preview_page = min(max(0, self._preview_page), last_page)
+        start = self._preview_page * _PREVIEW_CARDS
+        gen = self._thumb_gen
+        for i in range(_PREVIEW_CARDS):
             card = self.preview_cards[i]
-            if i >= len(sample):
+            idx = start + i
+            if idx >= total:
                 card.config(text="", image="")
                 continue
 
-            row = sample[i]
-            h = max(120, int(self._preview_h))
-            w = max(190, int(h * ratio))
-            label_img = _make_label_preview(row, w, h)
+            label_img = self._thumb_get(idx)
+            if label_img is None:
+                label_img = _make_label_preview(self._labels[idx], w, h, logo, scale, plan)
+                self._thumb_put(gen, idx, label_img)
             photo = ImageTk.PhotoImage(label_img)
             self._preview_imgs.append(photo)
             card.config(image=photo, text="")
             card.configure(compound="center")
 
+        self._update_preview_nav(total)
+        if start + _PREVIEW_CARDS < total:
+            self._prefetch(start + _PREVIEW_CARDS)
+
+    def _update_preview_nav(self, total: int) -> None:
+        last_page = max(0, (total - 1) // _PREVIEW_CARDS)
+        start = self._preview_page * _PREVIEW_CARDS
+        if total:
+            self.lbl_preview_pos.config(text=f"{start + 1}-{min(start + _PREVIEW_CARDS, total)} / {total}")
+        else:
+            self.lbl_preview_pos.config(text="0 / 0")
+        self._preview_scale_busy = True
+        try:
+            self.preview_scale.configure(to=max(1, last_page))
+            self.preview_scale.set(self._preview_page)
+        finally:
+            self._preview_scale_busy = False
+
+    def _go_preview_page(self, page: int) -> None:
+        last_page = max(0, (len(self._labels) - 1) // _PREVIEW_CARDS)
+        page = min(max(0, page), last_page)
+        if page != self._preview_page:
+            self._preview_page = page
+            self._render_preview()
+
+    def _jump_preview_row(self) -> None:
+        try:
+            row = int(self.preview_jump.get().strip())
+        except ValueError:
+            return
+        self._go_preview_page((max(1, row) - 1) // _PREVIEW_CARDS)
+
     def generate(self) -> None:
         out = self.output_path.get().strip()
         if not out:
@@ -641,7 +942,17 @@ class App(_BaseWindow):
             if not labels:
                 messagebox.showerror("Hata", "Dosyada etiket verisi bulunamadı")
                 return
-            generate_labels_pdf(labels, out, width_mm=w, height_mm=h, logo_path=logo, logo_scale=logo_scale)
+            if not self._preflight(labels, logo, logo_scale):
+                return
+            generate_labels_pdf(
+                labels,
+                out,
+                width_mm=w,
+                height_mm=h,
+                logo_path=logo,
+                logo_scale=logo_scale,
+                compact_images=self.compact_images.get(),
+            )
         except Exception as e:
             messagebox.showerror("Hata", str(e))
             return
@@ -690,7 +1001,17 @@ class App(_BaseWindow):
             if not labels:
                 messagebox.showerror("Hata", "Dosyada etiket verisi bulunamadı")
                 return
-            generate_qr_list_pdf(labels, list_out, cols=cols, rows=rows, logo_path=logo, logo_scale=logo_scale)
+            if not self._preflight(labels, logo, logo_scale):
+                return
+            generate_qr_list_pdf(
+                labels,
+                list_out,
+                cols=cols,
+                rows=rows,
+                logo_path=logo,
+                logo_scale=logo_scale,
+                compact_images=self.compact_images.get(),
+            )
         except Exception as e:
             messagebox.showerror("Hata", str(e))
             return
@@ -0,0 +1,204 @@
+import csv
+import hashlib
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from label_qr_pdf import LabelRow, generate_labels_pdf, iter_labels
+
+
+# (row number, key digest, row digest) per label; 32 bytes on disk.
+_RECORD = struct.Struct("<Q16s8s")
+# Catalogs up to this size are compared in memory; larger ones are hashed into buckets
+# of about this much source data each.
+_BUCKET_SOURCE_BYTES = 16 * 1024 * 1024
+_MAX_BUCKETS = 256
+_SPOOL_BYTES = 256 * 1024
+
+
+def _row_digests(row: LabelRow) -> Tuple[bytes, bytes]:
+    # Rows are matched by qr_text; everything else printed on the label decides "changed".
+    key = hashlib.blake2b(row.qr_text.encode("utf-8"), digest_size=16).digest()
+    body = f"{row.cins}\x1f{row.carpet_name}\x1f{row.quantity}".encode("utf-8")
+    return key, hashlib.blake2b(body, digest_size=8).digest()
+
+
+def _records(rows: Iterable[LabelRow]) -> Iterator[Tuple[int, bytes, bytes]]:
+    for row_no, row in enumerate(rows, 1):
+        key, digest = _row_digests(row)
+        yield row_no, key, digest
+
+
+class _Buckets:
+    # Records partitioned by key digest. A key always lands in the same bucket of both
+    # catalogs, and each bucket keeps file order, so buckets can be compared one pair at a time.
+
+    def __init__(self, directory: str, prefix: str, count: int) -> None:
+        self.paths = [os.path.join(directory, f"{prefix}{i:03d}.bin") for i in range(count)]
+        self._files: List[BinaryIO] = [open(p, "wb", buffering=_SPOOL_BYTES) for p in self.paths]
+
+    def add(self, row_no: int, key: bytes, digest: bytes) -> None:
+        # The key digest is already uniform; its first bytes pick the bucket.
+        i = int.from_bytes(key[:4], "little") % len(self._files)
+        self._files[i].write(_RECORD.pack(row_no, key, digest))
+
+    def close(self) -> None:
+        for f in self._files:
+            f.close()
+
+    def read(self, index: int) -> Iterator[Tuple[int, bytes, bytes]]:
+        with open(self.paths[index], "rb") as f:
+            yield from _RECORD.iter_unpack(f.read())
+
+
+@dataclass
+class DiffResult:
+    old_rows: int = 0
+    new_rows: int = 0
+    # Row numbers (1-based, in the new catalog) to reprint.
+    added: List[int] = field(default_factory=list)
+    changed: List[int] = field(default_factory=list)
+    removed: int = 0
+    buckets: int = 0
+
+    @property
+    def reprint(self) -> List[int]:
+        return sorted(self.added + self.changed)
+
+    def summary(self) -> str:
+        return (
+            f"eski {self.old_rows} kayıt, yeni {self.new_rows} kayıt: "
+            f"{len(self.added)} eklendi, {len(self.changed)} değişti, {self.removed} silindi"
+        )
+
+
+def _compare(
+    old: Iterable[Tuple[int, bytes, bytes]],
+    new: Iterable[Tuple[int, bytes, bytes]],
+    result: DiffResult,
+) -> None:
+    # Repeated qr_text values are paired by occurrence: the second "X" of the new catalog is
+    # compared with the second "X" of the old one. Only repeated keys get a counter.
+    index: Dict[bytes, bytes] = {}
+    repeats: Dict[bytes, int] = {}
+    rows = 0
+    for rows, (_row_no, key, digest) in enumerate(old, 1):
+        if key in index:
+            n = repeats.get(key, 1)
+            repeats[key] = n + 1
+            key += n.to_bytes(4, "little")
+        index[key] = digest
+    result.old_rows += rows
+
+    taken: Dict[bytes, int] = {}
+    rows = 0
+    for rows, (row_no, key, digest) in enumerate(new, 1):
+        if key in repeats:
+            n = taken.get(key, 0)
+            taken[key] = n + 1
+            if n:
+                key += n.to_bytes(4, "little")
+        before = index.pop(key, None)
+        if before is None:
+            result.added.append(row_no)
+        elif before != digest:
+            result.changed.append(row_no)
+    result.new_rows += rows
+    result.removed += len(index)
+
+
+def diff_catalogs(
+    old_path: str,
+    new_path: str,
+    encoding: str = "auto",
+    work_dir: Optional[str] = None,
+    buckets: int = 0,
+) -> DiffResult:
+    # Compares two catalog files without loading either into memory as rows. Small catalogs
+    # keep one digest index in memory; large ones are hashed into bucket files first, so
+    # memory is bounded by the largest bucket. buckets=0 picks the count from the file sizes.
+    if buckets <= 0:
+        size = max(os.path.getsize(old_path), os.path.getsize(new_path))
+        buckets = min(_MAX_BUCKETS, max(1, -(-size // _BUCKET_SOURCE_BYTES)))
+    result = DiffResult(buckets=buckets)
+    old = _records(iter_labels(old_path, encoding=encoding))
+    new = _records(iter_labels(new_path, encoding=encoding))
+    if buckets == 1:
+        _compare(old, new, result)
+        return result
+
+    tmp = tempfile.mkdtemp(prefix="etiket_fark_", dir=work_dir)
+    try:
+        parts: List[_Buckets] = []
+        for prefix, records in (("old", old), ("new", new)):
+            b = _Buckets(tmp, prefix, buckets)
+            try:
+                for rec in records:
+                    b.add(*rec)
+            finally:
+                b.close()
+            parts.append(b)
+        for i in range(buckets):
+            _compare(parts[0].read(i), parts[1].read(i), result)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return result
+
+
+def select_rows(path: str, row_numbers: Iterable[int], encoding: str = "auto") -> Iterator[LabelRow]:
+    # Second pass over the new catalog, yielding the chosen rows in file order.
+    wanted = set(row_numbers)
+    if not wanted:
+        return
+    last = max(wanted)
+    for row_no, row in enumerate(iter_labels(path, encoding=encoding), 1):
+        if row_no in wanted:
+            yield row
+        if row_no >= last:
+            return
+
+
+def write_labels_csv(rows: Iterable[LabelRow], path: str) -> int:
+    # A job file read_labels understands; UTF-8 with BOM so Excel shows Turkish letters.
+    count = 0
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["cins", "carpet_name", "qr_text", "quantity"])
+        for count, r in enumerate(rows, 1):
+            w.writerow([r.cins, r.carpet_name, r.qr_text, r.quantity])
+    return count
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    p = argparse.ArgumentParser(prog="label_diff")
+    p.add_argument("old", help="Önceki katalog (.txt veya .csv)")
+    p.add_argument("new", help="Güncel katalog (.txt veya .csv)")
+    p.add_argument("--out", default=None, help="Yeni/değişen kayıtlar: .csv iş dosyası veya .pdf etiket")
+    p.add_argument("--encoding", default="auto", help="Dosya encoding")
+    p.add_argument("--buckets", type=int, default=0, help="Disk üzerindeki kova sayısı (0: dosya boyutuna göre)")
+    p.add_argument("--tmp", default=None, help="Kova dosyaları için geçici klasör")
+    args = p.parse_args(argv)
+
+    result = diff_catalogs(args.old, args.new, encoding=args.encoding, work_dir=args.tmp, buckets=args.buckets)
+    print(result.summary(), file=sys.stderr)
+    if not args.out:
+        return 0
+    rows = select_rows(args.new, result.reprint, encoding=args.encoding)
+    if args.out.lower().endswith(".pdf"):
+        if not result.reprint:
+            print("Yazdırılacak kayıt yok", file=sys.stderr)
+            return 0
+        generate_labels_pdf(rows, args.out)
+    else:
+        write_labels_csv(rows, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_cli())
@@ -0,0 +1,391 @@
+import base64
+import functools
+import os
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+
+from PIL import Image, ImageDraw, ImageFont, TiffImagePlugin
+from reportlab.lib.units import mm
+
+from label_qr_pdf import (
+    LabelRow,
+    QrPlan,
+    _logo_tile,
+    _make_qr_bitmap,
+    _paste_logo,
+    _plan_for,
+    _qr_matrix,
+    _ttf_font_paths,
+    _turkish_upper,
+    read_labels,
+)
+
+
+EXPORT_FORMATS = ("png", "svg")
+EXPORT_LAYOUTS = ("qr", "label")
+
+_PT_PER_INCH = 72.0
+
+
+class _Options:
+    # Plain attribute bag so the settings pickle cheaply into worker processes.
+    def __init__(
+        self,
+        fmt: str,
+        layout: str,
+        dpi: int,
+        width_mm: float,
+        height_mm: float,
+        qr_mm: float,
+        margin_mm: float,
+        logo_path: Optional[str],
+        logo_scale: float,
+    ) -> None:
+        if fmt not in EXPORT_FORMATS + ("tiff",):
+            raise ValueError("Desteklenen formatlar: png, svg, tiff")
+        if layout not in EXPORT_LAYOUTS:
+            raise ValueError("Desteklenen yerleşimler: qr, label")
+        if dpi <= 0:
+            raise ValueError("dpi pozitif olmalı")
+        self.fmt = fmt
+        self.layout = layout
+        self.dpi = dpi
+        self.width_mm = width_mm
+        self.height_mm = height_mm
+        self.qr_mm = qr_mm
+        self.margin_mm = margin_mm
+        self.logo_path = logo_path if logo_path and os.path.exists(logo_path) else None
+        self.logo_scale = logo_scale
+        # Set by the export functions once the labels are known.
+        self.qr_plan: Optional[QrPlan] = None
+
+
+@functools.lru_cache(maxsize=32)
+def _font(size_px: int) -> ImageFont.ImageFont:
+    for path in _ttf_font_paths():
+        try:
+            return ImageFont.truetype(path, size=size_px)
+        except OSError:
+            continue
+    return ImageFont.load_default(size=size_px)
+
+
+def _wrap_lines(text: str, measure: Callable[[str], float], max_width: float) -> List[str]:
+    # Same greedy wrapping as label_qr_pdf._wrap_text.
+    words = (text or "").split()
+    lines: List[str] = []
+    line = ""
+    for w in words:
+        candidate = (line + " " + w).strip()
+        if measure(candidate) <= max_width:
+            line = candidate
+        else:
+            lines.append(line)
+            line = w
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _logo_for(opts: _Options, qr_px: int) -> Optional[Image.Image]:
+    if not opts.logo_path:
+        return None
+    try:
+        path = os.path.abspath(opts.logo_path)
+        return _logo_tile(path, os.stat(path).st_mtime_ns, int(qr_px * opts.logo_scale))
+    except Exception:
+        return None
+
+
+def _qr_px(opts: _Options, modules: int, side_mm: float) -> int:
+    # Whole pixels per module keep the modules square and sharp when printed.
+    target = side_mm / 25.4 * opts.dpi
+    return max(1, round(target / modules))
+
+
+def _render_qr_image(row: LabelRow, opts: _Options, box_px: Optional[int] = None) -> Image.Image:
+    # Encode once at one pixel per module, then scale up by a whole factor. With box_px the
+    # factor is the largest one that still fits a box of that many pixels.
+    bitmap = _make_qr_bitmap(row.qr_text, box_size=1, border=1, plan=opts.qr_plan)
+    n = bitmap.size[0]
+    side = n * (max(1, box_px // n) if box_px else _qr_px(opts, n, opts.qr_mm))
+    img = bitmap.resize((side, side), Image.Resampling.NEAREST).convert("RGB")
+    return _paste_logo(img, opts.logo_path, opts.logo_scale)
+
+
+def _render_label_image(row: LabelRow, opts: _Options) -> Image.Image:
+    # Raster copy of the generate_labels_pdf layout. Geometry is kept in PDF points
+    # (origin bottom-left) and converted at the end, so both outputs line up.
+    scale = opts.dpi / _PT_PER_INCH
+    page_w = opts.width_mm * mm
+    page_h = opts.height_mm * mm
+    qr_size = opts.qr_mm * mm
+    margin = opts.margin_mm * mm
+
+    img = Image.new("RGB", (round(page_w * scale), round(page_h * scale)), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+
+    def px(v: float) -> int:
+        return round(v * scale)
+
+    qr_x = page_w - margin - qr_size
+    qr_y = margin + (6 * mm)
+    # Whole pixels per module, centred in the QR box; resampling to the box size would
+    # make some modules a pixel wider than others.
+    box = px(qr_size)
+    qr_img = _render_qr_image(row, opts, box)
+    offset = (box - qr_img.size[0]) // 2
+    img.paste(qr_img, (px(qr_x) + offset, px(page_h - qr_y - qr_size) + offset))
+
+    text_x = margin
+    text_y_top = page_h - margin - 8
+    text_max_w = qr_x - margin - text_x
+
+    def text_block(text: str, size_pt: float, y: float, line_height: float) -> None:
+        font = _font(max(1, px(size_pt)))
+        lines = _wrap_lines(text, lambda t: draw.textlength(t, font=font) / scale, text_max_w)
+        for line in lines:
+            draw.text((px(text_x), px(page_h - y)), line, fill=(0, 0, 0), font=font, anchor="ls")
+            y -= line_height
+
+    font = _font(max(1, px(12)))
+    draw.text((px(text_x), px(page_h - text_y_top)), (row.cins or "").strip(), fill=(0, 0, 0), font=font, anchor="ls")
+    text_block(_turkish_upper((row.carpet_name or "").strip()), 10, text_y_top - 16, 12)
+    text_block((row.qr_text or "").strip(), 8, margin + 10, 10)
+    return img
+
+
+def _svg_qr_path(matrix: List[List[bool]], x0: float, y0: float, module: float) -> str:
+    # One subpath per horizontal run of dark modules.
+    parts: List[str] = []
+    for r, line in enumerate(matrix):
+        c = 0
+        n = len(line)
+        while c < n:
+            if not line[c]:
+                c += 1
+                continue
+            start = c
+            while c < n and line[c]:
+                c += 1
+            parts.append(
+                "M%.3f %.3fh%.3fv%.3fh-%.3fz"
+                % (x0 + start * module, y0 + r * module, (c - start) * module, module, (c - start) * module)
+            )
+    return '<path fill="#000" d="%s"/>' % "".join(parts)
+
+
+def _svg_logo(tile: Optional[Image.Image], x: float, y: float, side: float, qr_px: int) -> str:
+    if tile is None:
+        return ""
+    bio = BytesIO()
+    tile.save(bio, format="PNG")
+    k = side / qr_px
+    tw, th = tile.size
+    return '<image x="%.3f" y="%.3f" width="%.3f" height="%.3f" href="data:image/png;base64,%s"/>' % (
+        x + (qr_px - tw) // 2 * k,
+        y + (qr_px - th) // 2 * k,
+        tw * k,
+        th * k,
+        base64.b64encode(bio.getvalue()).decode("ascii"),
+    )
+
+
+def _render_svg(row: LabelRow, opts: _Options) -> bytes:
+    matrix = _qr_matrix(row.qr_text, plan=opts.qr_plan)
+    n = len(matrix)
+    # Logo size follows the 8 px/module raster used by the PDF output.
+    tile = _logo_for(opts, n * 8)
+
+    if opts.layout == "qr":
+        body = _svg_qr_path(matrix, 0, 0, 1) + _svg_logo(tile, 0, 0, n, n * 8)
+        doc = (
+            '<svg xmlns="http://www.w3.org/2000/svg" width="%smm" height="%smm" viewBox="0 0 %d %d" '
+            'shape-rendering="crispEdges"><rect width="100%%" height="100%%" fill="#fff"/>%s</svg>'
+            % (opts.qr_mm, opts.qr_mm, n, n, body)
+        )
+        return doc.encode("utf-8")
+
+    page_w = opts.width_mm * mm
+    page_h = opts.height_mm * mm
+    qr_size = opts.qr_mm * mm
+    margin = opts.margin_mm * mm
+    qr_x = page_w - margin - qr_size
+    qr_top = page_h - (margin + 6 * mm) - qr_size
+    text_x = margin
+    text_y_top = page_h - margin - 8
+    text_max_w = qr_x - margin - text_x
+
+    out: List[str] = [_svg_qr_path(matrix, qr_x, qr_top, qr_size / n), _svg_logo(tile, qr_x, qr_top, qr_size, n * 8)]
+
+    def text(s: str, size_pt: float, y: float) -> None:
+        out.append(
+            '<text x="%.3f" y="%.3f" font-size="%s">%s</text>' % (text_x, page_h - y, size_pt, escape(s))
+        )
+
+    def text_block(s: str, size_pt: float, y: float, line_height: float) -> None:
+        # SVG has no text layout; wrap with the raster font metrics at 72 dpi (1 px = 1 pt).
+        font = _font(max(1, round(size_pt * 4)))
+        for line in _wrap_lines(s, lambda t: font.getlength(t) / 4, text_max_w):
+            text(line, size_pt, y)
+            y -= line_height
+
+    text((row.cins or "").strip(), 12, text_y_top)
+    text_block(_turkish_upper((row.carpet_name or "").strip()), 10, text_y_top - 16, 12)
+    text_block((row.qr_text or "").strip(), 8, margin + 10, 10)
+
+    doc = (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="%smm" height="%smm" viewBox="0 0 %.3f %.3f">'
+        '<rect width="100%%" height="100%%" fill="#fff"/>'
+        '<g font-family="Arial, Helvetica, sans-serif" fill="#000">%s</g></svg>'
+        % (opts.width_mm, opts.height_mm, page_w, page_h, "".join(out))
+    )
+    return doc.encode("utf-8")
+
+
+def _render_raster(row: LabelRow, opts: _Options) -> Image.Image:
+    if opts.layout == "qr":
+        return _render_qr_image(row, opts)
+    return _render_label_image(row, opts)
+
+
+def _render_entry(item: Tuple[int, Tuple[str, str, str, int]], opts: _Options) -> bytes:
+    row = LabelRow(*item[1])
+    if opts.fmt == "svg":
+        return _render_svg(row, opts)
+    img = _render_raster(row, opts)
+    bio = BytesIO()
+    if opts.fmt == "tiff":
+        # 1-bit pages; the writer in the parent process only appends them.
+        img.convert("1").save(bio, format="TIFF", compression="group4", dpi=(opts.dpi, opts.dpi))
+    else:
+        img.save(bio, format="PNG", dpi=(opts.dpi, opts.dpi))
+    return bio.getvalue()
+
+
+def _render_ordered(labels: Iterable[LabelRow], opts: _Options, workers: int) -> Iterator[Tuple[int, LabelRow, bytes]]:
+    # Renders in a process pool with a bounded window of in-flight rows, yielding results
+    # in input order. Only the window is ever held in memory.
+    # Rows with quantity 0 are skipped, as in the PDF; one file per row otherwise.
+    items = ((i, (r.cins, r.carpet_name, r.qr_text, r.quantity)) for i, r in enumerate(labels) if r.quantity > 0)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    if workers == 1:
+        for item in items:
+            yield item[0], LabelRow(*item[1]), _render_entry(item, opts)
+        return
+
+    window: deque = deque()
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for item in items:
+            window.append((item, ex.submit(_render_entry, item, opts)))
+            if len(window) >= workers * 4:
+                done, fut = window.popleft()
+                yield done[0], LabelRow(*done[1]), fut.result()
+        while window:
+            done, fut = window.popleft()
+            yield done[0], LabelRow(*done[1]), fut.result()
+
+
+def _entry_name(index: int, row: LabelRow, ext: str) -> str:
+    slug = re.sub(r"[^0-9A-Za-z._-]+", "_", row.qr_text).strip("_")[:80] or "etiket"
+    return f"{index + 1:06d}_{slug}.{ext}"
+
+
+def export_labels_zip(
+    labels: Iterable[LabelRow],
+    output: Union[str, BinaryIO],
+    fmt: str = "png",
+    layout: str = "qr",
+    dpi: int = 300,
+    width_mm: float = 80.0,
+    height_mm: float = 50.0,
+    qr_mm: float = 32.0,
+    margin_mm: float = 4.0,
+    logo_path: Optional[str] = None,
+    logo_scale: float = 0.22,
+    workers: int = 0,
+) -> int:
+    # One PNG/SVG per label, written into the ZIP as soon as it is rendered. `output` may be a
+    # path or any writable binary stream (the ZIP is written without seeking).
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError("ZIP için desteklenen formatlar: png, svg")
+    opts = _Options(fmt, layout, dpi, width_mm, height_mm, qr_mm, margin_mm, logo_path, logo_scale)
+    opts.qr_plan = _plan_for(labels, opts.logo_path, logo_scale)
+    # PNG is already deflated; SVG compresses well.
+    compression = zipfile.ZIP_DEFLATED if fmt == "svg" else zipfile.ZIP_STORED
+    count = 0
+    with zipfile.ZipFile(output, "w", compression=compression) as zf:
+        for index, row, data in _render_ordered(labels, opts, workers):
+            zf.writestr(_entry_name(index, row, fmt), data)
+            count += 1
+    return count
+
+
+def export_labels_tiff(
+    labels: Iterable[LabelRow],
+    output_path: str,
+    layout: str = "label",
+    dpi: int = 300,
+    width_mm: float = 80.0,
+    height_mm: float = 50.0,
+    qr_mm: float = 32.0,
+    margin_mm: float = 4.0,
+    logo_path: Optional[str] = None,
+    logo_scale: float = 0.22,
+    workers: int = 0,
+) -> int:
+    # Multipage 1-bit (CCITT G4) TIFF at the printer resolution, one page per label.
+    opts = _Options("tiff", layout, dpi, width_mm, height_mm, qr_mm, margin_mm, logo_path, logo_scale)
+    opts.qr_plan = _plan_for(labels, opts.logo_path, logo_scale)
+    count = 0
+    with TiffImagePlugin.AppendingTiffWriter(output_path, new=True) as tf:
+        for _index, _row, data in _render_ordered(labels, opts, workers):
+            with Image.open(BytesIO(data)) as page:
+                page.save(tf, format="TIFF", compression="group4", dpi=(dpi, dpi))
+            tf.newFrame()
+            count += 1
+    return count
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    p = argparse.ArgumentParser(prog="label_export")
+    p.add_argument("input", help=".txt veya .csv")
+    p.add_argument("--out", required=True, help="Çıktı (.zip veya .tif)")
+    p.add_argument("--format", choices=("png", "svg", "tiff"), default="png", help="Görüntü formatı")
+    p.add_argument("--layout", choices=EXPORT_LAYOUTS, default="qr", help="Sadece QR veya tam etiket")
+    p.add_argument("--dpi", type=int, default=300, help="Yazıcı çözünürlüğü")
+    p.add_argument("--width", type=float, default=80.0, help="Etiket genişliği (mm)")
+    p.add_argument("--height", type=float, default=50.0, help="Etiket yüksekliği (mm)")
+    p.add_argument("--logo", default=None, help="Logo dosyası")
+    p.add_argument("--logo-scale", type=float, default=0.22, help="Logo oranı")
+    p.add_argument("--encoding", default="auto", help="Dosya encoding")
+    p.add_argument("--workers", type=int, default=0, help="Paralel render işlemi sayısı (0: tüm çekirdekler)")
+    args = p.parse_args(argv)
+
+    labels = read_labels(args.input, encoding=args.encoding)
+    common = dict(
+        layout=args.layout,
+        dpi=args.dpi,
+        width_mm=args.width,
+        height_mm=args.height,
+        logo_path=args.logo,
+        logo_scale=args.logo_scale,
+        workers=args.workers,
+    )
+    if args.format == "tiff":
+        export_labels_tiff(labels, args.out, **common)
+    else:
+        export_labels_zip(labels, args.out, fmt=args.format, **common)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_cli())
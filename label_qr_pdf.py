@@ -1,56 +1,142 @@
+import codecs
 import csv
+import functools
+import hashlib
+import io
+import mmap
 import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
 import unicodedata
-from dataclasses import dataclass
+import zlib
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from io import BytesIO
-from typing import Iterable, List, Optional
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import qrcode
 from PIL import Image
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
 from reportlab.lib.utils import ImageReader
-from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase import pdfdoc, pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen.canvas import Canvas
 
+try:
+    import pikepdf
+except Exception:  # pragma: no cover
+    pikepdf = None
+
+try:
+    import segno
+except Exception:  # pragma: no cover
+    segno = None
+
 
 @dataclass(frozen=True)
 class LabelRow:
     cins: str
     carpet_name: str
     qr_text: str
+    # Number of copies to print; rendered once and repeated.
+    quantity: int = 1
 
 
 _FONT_NAME: Optional[str] = None
+_FONT_PATH: Optional[str] = None
+_FONT_RESOLVED = False
+_FONT_LOCK = threading.Lock()
+# Registered copies of the label font that no job is using right now. ReportLab's TTFont
+# reads the font file through a shared cursor and keeps per-document subset state, so one
+# copy belongs to one job at a time; concurrent jobs get copies of their own.
+_FONT_FREE: List[str] = []
+_FONT_COPIES = 0
+_FONT_CANDIDATES = (
+    "arial.ttf",
+    "arialuni.ttf",
+    "segoeui.ttf",
+    "calibri.ttf",
+    "tahoma.ttf",
+)
+
+
+def _ttf_font_paths() -> Iterator[str]:
+    fonts_dir = os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts")
+    for fn in _FONT_CANDIDATES:
+        path = os.path.join(fonts_dir, fn)
+        if os.path.exists(path):
+            yield path
 
 
 def _try_register_ttf_font() -> Optional[str]:
-    global _FONT_NAME
-    if _FONT_NAME is not None:
+    # Finds and registers the label font once per process; None means Helvetica.
+    global _FONT_NAME, _FONT_PATH, _FONT_RESOLVED, _FONT_COPIES
+    if _FONT_RESOLVED:
         return _FONT_NAME
 
-    candidates = [
-        "arial.ttf",
-        "arialuni.ttf",
-        "segoeui.ttf",
-        "calibri.ttf",
-        "tahoma.ttf",
-    ]
-    fonts_dir = os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts")
-    for fn in candidates:
-        path = os.path.join(fonts_dir, fn)
-        if os.path.exists(path):
-            name = os.path.splitext(fn)[0]
+    with _FONT_LOCK:
+        if _FONT_RESOLVED:
+            return _FONT_NAME
+        # ReportLab registers standard fonts lazily on first use; do it here, not in a job.
+        pdfmetrics.getFont("Helvetica")
+        for path in _ttf_font_paths():
+            name = os.path.splitext(os.path.basename(path))[0]
             try:
                 pdfmetrics.registerFont(TTFont(name, path))
-                _FONT_NAME = name
-                return _FONT_NAME
             except Exception:
                 continue
+            _FONT_NAME = name
+            _FONT_PATH = path
+            _FONT_COPIES = 1
+            _FONT_FREE.append(name)
+            break
+        _FONT_RESOLVED = True
+    return _FONT_NAME
+
+
+def _acquire_font() -> str:
+    global _FONT_COPIES
+    base = _try_register_ttf_font()
+    if base is None:
+        return "Helvetica"
+    with _FONT_LOCK:
+        if _FONT_FREE:
+            return _FONT_FREE.pop()
+        _FONT_COPIES += 1
+        name = f"{base}-{_FONT_COPIES}"
+    # Parsing the font takes a while; only the registry update needs the lock.
+    font = TTFont(name, _FONT_PATH)
+    with _FONT_LOCK:
+        pdfmetrics.registerFont(font)
+    return name
+
+
+def _release_font(name: str) -> None:
+    if name == "Helvetica":
+        return
+    with _FONT_LOCK:
+        _FONT_FREE.append(name)
 
-    _FONT_NAME = None
-    return None
+
+class _RenderContext:
+    # Per-job render state: a copy of the label font held from the first page until the
+    # document is saved (fonts are subset at save time).
+
+    def __init__(self) -> None:
+        self.font_name = _acquire_font()
+
+    def __enter__(self) -> "_RenderContext":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _release_font(self.font_name)
 
 
 def _normalize_header(s: str) -> str:
@@ -69,6 +155,64 @@ def _normalize_header(s: str) -> str:
     return s
 
 
+_DETECT_SAMPLE_BYTES = 64 * 1024
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _valid_utf8(data: bytes, final: bool) -> bool:
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(data, final=final)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+@functools.lru_cache(maxsize=256)
+def _detect_encoding_cached(path: str, size: int, mtime_ns: int) -> str:
+    with open(path, "rb") as f:
+        head = f.read(_DETECT_SAMPLE_BYTES)
+        tail = b""
+        if size > 2 * _DETECT_SAMPLE_BYTES:
+            f.seek(-_DETECT_SAMPLE_BYTES, os.SEEK_END)
+            tail = f.read()
+
+    for bom, name in _BOMS:
+        if head.startswith(bom):
+            return name
+
+    # The tail sample may start in the middle of a multi-byte sequence.
+    cut = 0
+    while cut < 3 and cut < len(tail) and 0x80 <= tail[cut] <= 0xBF:
+        cut += 1
+    if _valid_utf8(head, final=size <= len(head)) and _valid_utf8(tail[cut:], final=True):
+        return "utf-8"
+
+    # Turkish Windows exports: cp1254 is the common case; bytes it leaves undefined
+    # (0x81, 0x8D-0x90, 0x9D, 0x9E) only make sense as ISO-8859-9 control codes.
+    try:
+        (head + tail).decode("cp1254")
+        return "cp1254"
+    except UnicodeDecodeError:
+        return "iso-8859-9"
+
+
+def detect_encoding(path: str) -> str:
+    st = os.stat(path)
+    return _detect_encoding_cached(os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+def _resolve_encoding(path: str, encoding: Optional[str]) -> str:
+    if not encoding or encoding.strip().lower() == "auto":
+        return detect_encoding(path)
+    return encoding
+
+
 def _sniff_dialect(sample: str) -> csv.Dialect:
     try:
         return csv.Sniffer().sniff(sample, delimiters=[",", ";", "\t", "|"])
@@ -76,110 +220,508 @@ def _sniff_dialect(sample: str) -> csv.Dialect:
         return csv.excel
 
 
-def read_labels_from_txt(path: str, encoding: str = "utf-8") -> List[LabelRow]:
-    rows: List[LabelRow] = []
+def _parse_txt_line(line: str) -> Optional[LabelRow]:
+    line = line.strip()
+    if not line or ":" not in line:
+        return None
+    cins, rest = line.split(":", 1)
+    return LabelRow(cins=cins.strip(), carpet_name=rest.strip().replace("-", " "), qr_text=line)
+
+
+# A line containing a colon. Matching runs in C directly over the mapped file, so lines
+# that are skipped are never copied or decoded.
+_TXT_LINE = re.compile(rb"^[^\n:]*:[^\n]*", re.M)
+_TXT_BLOCK_BYTES = 4 * 1024 * 1024
+
+
+def _txt_mmap_start(mm: mmap.mmap, encoding: str) -> Optional[int]:
+    # Returns the first byte to read, or None when the byte scanner cannot be used.
+    name = codecs.lookup(encoding).name
+    if name == "utf-8-sig":
+        return 3 if mm[:3] == codecs.BOM_UTF8 else 0
+    if not _ascii_compatible(encoding):
+        return None
+    # Old Mac files use a lone CR as line break; the text reader handles those.
+    cr = mm.find(b"\r")
+    if cr >= 0 and mm[cr + 1 : cr + 2] != b"\n":
+        return None
+    return 0
+
+
+def _scan_txt_spans(mm: mmap.mmap, start: int) -> Iterator[Tuple[int, int]]:
+    for m in _TXT_LINE.finditer(mm):
+        a, b = m.span()
+        # Only the first line can begin before start (it carries the BOM).
+        yield max(a, start), b
+
+
+class MappedTxtLabels(Sequence):
+    # Lazy, read-only view of a CINS:slug file: only line offsets are kept in memory and
+    # a LabelRow is read and decoded when it is accessed. The file is mapped only while the
+    # index is built, so other programs can rewrite it while it is shown; a changed size or
+    # mtime rebuilds the index before the next read.
+
+    def __init__(self, path: str, encoding: str = "utf-8") -> None:
+        self.path = path
+        self._encoding = _resolve_encoding(path, encoding)
+        self._decode = "utf-8" if codecs.lookup(self._encoding).name == "utf-8-sig" else self._encoding
+        self._starts = array("q")
+        self._ends = array("q")
+        self._sig: Optional[Tuple[int, int]] = None
+        self._index()
+
+    def _index(self) -> None:
+        starts = array("q")
+        ends = array("q")
+        with open(self.path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if st.st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    pos = _txt_mmap_start(mm, self._encoding)
+                    if pos is None:
+                        raise ValueError(f"{self._encoding} için bellek eşlemeli okuma desteklenmiyor")
+                    for a, b in _scan_txt_spans(mm, pos):
+                        starts.append(a)
+                        ends.append(b)
+        self._starts = starts
+        self._ends = ends
+        self._sig = (st.st_size, st.st_mtime_ns)
+
+    def _check(self) -> None:
+        try:
+            st = os.stat(self.path)
+            if (st.st_size, st.st_mtime_ns) != self._sig:
+                self._index()
+        except (OSError, ValueError):
+            # Gone or no longer readable this way: show nothing rather than stale rows.
+            self._starts = array("q")
+            self._ends = array("q")
+            self._sig = None
+
+    def _read(self, indices: Iterable[int]) -> Iterator[LabelRow]:
+        with open(self.path, "rb") as f:
+            for i in indices:
+                a = self._starts[i]
+                f.seek(a)
+                yield _parse_txt_line(f.read(self._ends[i] - a).decode(self._decode, errors="replace"))
+
+    def __len__(self) -> int:
+        self._check()
+        return len(self._starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._read(range(*index.indices(len(self)))))
+        self._check()
+        if not -len(self._starts) <= index < len(self._starts):
+            raise IndexError(index)
+        return next(self._read([index]))
+
+    def __iter__(self) -> Iterator[LabelRow]:
+        return self._read(range(len(self)))
+
+    def offset(self, index: int) -> int:
+        return self._starts[index]
+
+    def close(self) -> None:
+        # Nothing is held open between reads; kept for callers using it as a context manager.
+        pass
+
+    def __enter__(self) -> "MappedTxtLabels":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class LineIndexedLabels(Sequence):
+    # Parsed CINS:slug text kept per line, for text that is edited in place (the manual
+    # entry box). An edit replaces a range of lines and only those are parsed again;
+    # indexing goes over the label rows, skipping lines that are not labels.
+
+    def __init__(self, text: str = "") -> None:
+        self._lines: List[Optional[LabelRow]] = []
+        self._rows: Optional[List[LabelRow]] = None
+        # UTF-8 length of qr_text -> number of rows, so the longest text is known without a scan.
+        self._qr_lengths: Dict[int, int] = {}
+        # Row ranges changed since take_edits(); None after set_text (everything changed).
+        self._edits: Optional[List[Tuple[int, int, int]]] = None
+        self.set_text(text)
+
+    def set_text(self, text: str) -> None:
+        self._lines = [_parse_txt_line(ln) for ln in text.split("\n")]
+        self._rows = None
+        self._qr_lengths = {}
+        self._count_lengths(self._lines, 1)
+        self._edits = None
+
+    def _count_lengths(self, rows: Iterable[Optional[LabelRow]], sign: int) -> None:
+        lengths = self._qr_lengths
+        for r in rows:
+            if r is not None:
+                n = len(r.qr_text.encode("utf-8"))
+                left = lengths.get(n, 0) + sign
+                if left:
+                    lengths[n] = left
+                else:
+                    del lengths[n]
+
+    def replace_lines(self, first: int, count: int, lines: Iterable[str]) -> None:
+        # Lines first .. first+count-1 (0-based) now read `lines`.
+        old = self._lines[first : first + count]
+        new = [_parse_txt_line(ln) for ln in lines]
+        self._lines[first : first + count] = new
+        old_rows = [r for r in old if r is not None]
+        new_rows = [r for r in new if r is not None]
+        if old_rows == new_rows:
+            return
+        self._count_lengths(old_rows, -1)
+        self._count_lengths(new_rows, 1)
+        start = first - self._lines[:first].count(None)
+        if self._rows is not None:
+            # A new list, not an in-place splice: earlier rows() results stay unchanged.
+            self._rows = self._rows[:start] + new_rows + self._rows[start + len(old_rows) :]
+        if self._edits is not None:
+            self._edits.append((start, len(old_rows), len(new_rows)))
+
+    def take_edits(self) -> Optional[List[Tuple[int, int, int]]]:
+        # (first row, old row count, new row count) per edit since the last call, in order,
+        # or None when the whole text was replaced.
+        edits, self._edits = self._edits, []
+        return edits
+
+    @property
+    def longest_qr_bytes(self) -> int:
+        return max(self._qr_lengths, default=0)
+
+    @property
+    def line_count(self) -> int:
+        return len(self._lines)
+
+    def rows(self) -> List[LabelRow]:
+        # Rebuilt after an edit only; the returned list is never mutated afterwards.
+        if self._rows is None:
+            self._rows = [r for r in self._lines if r is not None]
+        return self._rows
+
+    def __len__(self) -> int:
+        return len(self.rows())
+
+    def __getitem__(self, index):
+        return self.rows()[index]
+
+
+def iter_labels_from_txt(path: str, encoding: str = "utf-8") -> Iterator[LabelRow]:
+    # Rows in file order, a block at a time; memory does not grow with the file.
+    encoding = _resolve_encoding(path, encoding)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = _txt_mmap_start(mm, encoding)
+            if pos is not None:
+                dec = "utf-8" if codecs.lookup(encoding).name == "utf-8-sig" else encoding
+                size = len(mm)
+                # Decode in bounded blocks cut at line breaks instead of line by line.
+                while pos < size:
+                    end = mm.find(b"\n", min(pos + _TXT_BLOCK_BYTES, size))
+                    end = size if end < 0 else end + 1
+                    for line in mm[pos:end].decode(dec, errors="replace").split("\n"):
+                        if ":" in line:
+                            row = _parse_txt_line(line)
+                            if row is not None:
+                                yield row
+                    pos = end
+                return
+
     with open(path, "r", encoding=encoding, errors="replace") as f:
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            if ":" not in line:
-                continue
-            cins, rest = line.split(":", 1)
-            cins = cins.strip()
-            rest = rest.strip()
-            carpet_name = rest.replace("-", " ")
-            rows.append(LabelRow(cins=cins, carpet_name=carpet_name, qr_text=line))
-    return rows
+            row = _parse_txt_line(line)
+            if row is not None:
+                yield row
 
 
-def read_labels_from_csv(path: str, encoding: str = "utf-8") -> List[LabelRow]:
-    with open(path, "r", encoding=encoding, errors="replace", newline="") as f:
-        sample = f.read(4096)
-        f.seek(0)
-        dialect = _sniff_dialect(sample)
-        reader = csv.DictReader(f, dialect=dialect)
-        if not reader.fieldnames:
-            return []
-
-        header_map = {_normalize_header(h): h for h in reader.fieldnames}
-
-        def get_field(d: dict, *names: str) -> Optional[str]:
-            for n in names:
-                key = header_map.get(_normalize_header(n))
-                if key is not None:
-                    v = d.get(key)
-                    if v is not None and str(v).strip() != "":
-                        return str(v).strip()
-            return None
-
-        rows: List[LabelRow] = []
-        for d in reader:
-            cins = get_field(
-                d,
-                "cins",
-                "turu",
-                "tur",
-                "type",
-                "category",
-            )
-            if not cins:
-                continue
+def read_labels_from_txt(path: str, encoding: str = "utf-8") -> List[LabelRow]:
+    return list(iter_labels_from_txt(path, encoding=encoding))
 
-            carpet_name = get_field(
-                d,
-                "carpet_name",
-                "carpet name",
-                "name",
-                "hali",
-                "hali adi",
-                "hali adı",
-                "hali ismi",
-                "halı",
-                "halı adi",
-                "halı adı",
-                "halı ismi",
-            )
-            carpet_name2 = get_field(
-                d,
-                "carpet_name2",
-                "carpet_name_2",
-                "slug",
-                "kod",
-                "code",
-            )
-            qr_text = get_field(
-                d,
-                "qr_code",
-                "qr",
-                "qr_text",
-                "qr text",
-                "qr kod",
-                "qr kodu",
-            )
 
-            if not carpet_name and carpet_name2:
-                carpet_name = carpet_name2.replace("-", " ")
-            if not carpet_name:
-                carpet_name = ""
+def _ascii_compatible(encoding: str) -> bool:
+    try:
+        return "\r\n:".encode(encoding) == b"\r\n:"
+    except (LookupError, UnicodeError):
+        return False
+
+
+_CINS_HEADERS = ("cins", "turu", "tur", "type", "category")
+_NAME_HEADERS = (
+    "carpet_name",
+    "carpet name",
+    "name",
+    "hali",
+    "hali adi",
+    "hali adı",
+    "hali ismi",
+    "halı",
+    "halı adi",
+    "halı adı",
+    "halı ismi",
+)
+_NAME2_HEADERS = ("carpet_name2", "carpet_name_2", "slug", "kod", "code")
+_QR_HEADERS = ("qr_code", "qr", "qr_text", "qr text", "qr kod", "qr kodu")
+_QTY_HEADERS = ("quantity", "qty", "adet", "miktar", "copies", "kopya", "kopya sayisi", "etiket adedi")
+
+# Files smaller than this are always parsed sequentially; process start-up would dominate.
+_CSV_PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
 
-            if not qr_text:
-                if carpet_name2:
-                    qr_text = f"{cins}:{carpet_name2}"
-                else:
-                    qr_text = f"{cins}:{carpet_name.replace(' ', '-')}"
+@dataclass(frozen=True)
+class _CsvColumns:
+    cins: Tuple[int, ...]
+    name: Tuple[int, ...]
+    name2: Tuple[int, ...]
+    qr: Tuple[int, ...]
+    qty: Tuple[int, ...]
+
+
+def _resolve_columns(fieldnames: List[str]) -> _CsvColumns:
+    # Later duplicates win, same as the old dict-based header map.
+    index = {_normalize_header(h): i for i, h in enumerate(fieldnames)}
+
+    def cols(names: Tuple[str, ...]) -> Tuple[int, ...]:
+        out: List[int] = []
+        for n in names:
+            i = index.get(_normalize_header(n))
+            if i is not None and i not in out:
+                out.append(i)
+        return tuple(out)
+
+    return _CsvColumns(
+        cins=cols(_CINS_HEADERS),
+        name=cols(_NAME_HEADERS),
+        name2=cols(_NAME2_HEADERS),
+        qr=cols(_QR_HEADERS),
+        qty=cols(_QTY_HEADERS),
+    )
+
+
+def _pick(fields: List[str], cols: Tuple[int, ...]) -> Optional[str]:
+    n = len(fields)
+    for i in cols:
+        if i < n:
+            v = fields[i].strip()
+            if v:
+                return v
+    return None
+
+
+# Upper bound for one row's copies; larger cells are typos (or "inf") rather than orders.
+_MAX_QUANTITY = 10000
+
+
+def _parse_quantity(value: Optional[str]) -> int:
+    # Empty or unreadable cells mean a single label; "20,0" style exports are accepted.
+    if not value:
+        return 1
+    try:
+        return min(_MAX_QUANTITY, max(0, int(float(value.replace(",", ".")))))
+    except (ValueError, OverflowError):
+        return 1
+
+
+def _row_from_fields(fields: List[str], cols: _CsvColumns) -> Optional[LabelRow]:
+    cins = _pick(fields, cols.cins)
+    if not cins:
+        return None
+
+    carpet_name = _pick(fields, cols.name)
+    carpet_name2 = _pick(fields, cols.name2)
+    qr_text = _pick(fields, cols.qr)
+
+    if not carpet_name and carpet_name2:
+        carpet_name = carpet_name2.replace("-", " ")
+    if not carpet_name:
+        carpet_name = ""
+
+    if not qr_text:
+        if carpet_name2:
+            qr_text = f"{cins}:{carpet_name2}"
+        else:
+            qr_text = f"{cins}:{carpet_name.replace(' ', '-')}"
+
+    quantity = _parse_quantity(_pick(fields, cols.qty))
+    return LabelRow(cins=cins, carpet_name=carpet_name, qr_text=qr_text, quantity=quantity)
+
+
+def _row_from_json(item: object) -> Optional[LabelRow]:
+    # One label from a JSON document or JSONL line: a "CINS:slug" string or an object with
+    # cins/carpet_name/qr_text and optional quantity (adet).
+    if isinstance(item, str):
+        return _parse_txt_line(item)
+    if not isinstance(item, dict):
+        raise ValueError("Etiket kaydı nesne veya 'CINS:slug' metni olmalı")
+    cins = str(item.get("cins") or "").strip()
+    if not cins:
+        return None
+    carpet_name = str(item.get("carpet_name") or "").strip()
+    qr_text = str(item.get("qr_text") or "").strip() or f"{cins}:{carpet_name.replace(' ', '-')}"
+    quantity = _parse_quantity(str(item.get("quantity", item.get("adet")) or ""))
+    return LabelRow(cins=cins, carpet_name=carpet_name, qr_text=qr_text, quantity=quantity)
+
+
+def _dialect_params(dialect) -> Dict[str, object]:
+    # Sniffed dialects are local classes and cannot be pickled into worker processes.
+    return {
+        "delimiter": dialect.delimiter,
+        "quotechar": dialect.quotechar,
+        "doublequote": dialect.doublequote,
+        "skipinitialspace": dialect.skipinitialspace,
+        "quoting": dialect.quoting,
+        "escapechar": dialect.escapechar,
+    }
+
+
+def _parse_csv_chunk(
+    path: str,
+    start: int,
+    end: int,
+    encoding: str,
+    params: Dict[str, object],
+    cols: _CsvColumns,
+) -> Optional[List[Tuple[str, str, str, int]]]:
+    # None when the chunk does not parse cleanly on its own: a quoted field still open at
+    # `end` (a line break inside a note or address cell) or a row only the lenient
+    # sequential reader accepts. Every boundary is the end of one chunk, so checking the
+    # ends is enough.
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    text = data.decode(encoding, errors="replace")
+    # Plain tuples pickle several times faster than frozen dataclasses.
+    rows: List[Tuple[str, str, str, int]] = []
+    try:
+        for fields in csv.reader(io.StringIO(text, newline=""), strict=True, **params):
+            if not fields:
+                continue
+            row = _row_from_fields(fields, cols)
+            if row is not None:
+                rows.append((row.cins, row.carpet_name, row.qr_text, row.quantity))
+    except csv.Error:
+        return None
+    return rows
+
+
+def _chunk_offsets(path: str, start: int, size: int, parts: int) -> List[Tuple[int, int]]:
+    step = max(1, (size - start) // parts)
+    bounds = [start]
+    with open(path, "rb") as f:
+        pos = start
+        while True:
+            pos += step
+            if pos >= size:
+                break
+            f.seek(pos)
+            f.readline()
+            pos = f.tell()
+            if pos >= size:
+                break
+            bounds.append(pos)
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _read_labels_from_csv_parallel(
+    path: str,
+    encoding: str,
+    params: Dict[str, object],
+    workers: int,
+) -> Optional[List[LabelRow]]:
+    # None means the file cannot be split at line boundaries; the caller reads it sequentially.
+    with open(path, "rb") as f:
+        header_line = f.readline()
+        data_start = f.tell()
+    size = os.path.getsize(path)
 
-            rows.append(LabelRow(cins=cins, carpet_name=carpet_name, qr_text=qr_text))
+    try:
+        header = next(
+            csv.reader(io.StringIO(header_line.decode(encoding, errors="replace"), newline=""), strict=True, **params),
+            None,
+        )
+    except csv.Error:
+        return None
+    if not header:
+        return []
+    cols = _resolve_columns(header)
 
+    # Several chunks per worker keeps the pool busy when rows are uneven.
+    chunks = _chunk_offsets(path, data_start, size, workers * 4)
+    rows: List[LabelRow] = []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = [ex.submit(_parse_csv_chunk, path, a, b, encoding, params, cols) for a, b in chunks]
+        for fut in futures:
+            part = fut.result()
+            if part is None:
+                for f in futures:
+                    f.cancel()
+                return None
+            rows.extend(LabelRow(*t) for t in part)
     return rows
 
 
-def read_labels(path: str, encoding: str = "utf-8") -> List[LabelRow]:
+def iter_labels_from_csv(path: str, encoding: str = "utf-8") -> Iterator[LabelRow]:
+    # Sequential counterpart of read_labels_from_csv that yields rows as they are parsed.
+    encoding = _resolve_encoding(path, encoding)
+    with open(path, "r", encoding=encoding, errors="replace", newline="") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        reader = csv.reader(f, **_dialect_params(_sniff_dialect(sample)))
+        header = next(reader, None)
+        if not header:
+            return
+        cols = _resolve_columns(header)
+        for fields in reader:
+            if not fields:
+                continue
+            row = _row_from_fields(fields, cols)
+            if row is not None:
+                yield row
+
+
+def read_labels_from_csv(path: str, encoding: str = "utf-8", workers: int = 1) -> List[LabelRow]:
+    # workers > 1 (or 0 for all cores) splits large files at line boundaries and parses the
+    # chunks in a process pool. If a boundary falls inside a quoted field that spans lines,
+    # the file is read sequentially instead.
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    encoding = _resolve_encoding(path, encoding)
+
+    if (
+        workers > 1
+        and _ascii_compatible(encoding)
+        and os.path.getsize(path) >= _CSV_PARALLEL_MIN_BYTES
+    ):
+        with open(path, "r", encoding=encoding, errors="replace", newline="") as f:
+            params = _dialect_params(_sniff_dialect(f.read(4096)))
+        rows = _read_labels_from_csv_parallel(path, encoding, params, workers)
+        if rows is not None:
+            return rows
+    return list(iter_labels_from_csv(path, encoding=encoding))
+
+
+def read_labels(path: str, encoding: str = "auto", workers: int = 1) -> List[LabelRow]:
     ext = os.path.splitext(path)[1].lower()
     if ext == ".txt":
         return read_labels_from_txt(path, encoding=encoding)
     if ext == ".csv":
-        return read_labels_from_csv(path, encoding=encoding)
+        return read_labels_from_csv(path, encoding=encoding, workers=workers)
+    raise ValueError("Desteklenen dosya uzantıları: .txt, .csv")
+
+
+def iter_labels(path: str, encoding: str = "auto") -> Iterator[LabelRow]:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".txt":
+        return iter_labels_from_txt(path, encoding=encoding)
+    if ext == ".csv":
+        return iter_labels_from_csv(path, encoding=encoding)
     raise ValueError("Desteklenen dosya uzantıları: .txt, .csv")
 
 
@@ -187,52 +729,484 @@ def _make_qr_image(qr_text: str, box_size: int = 8, border: int = 1) -> Image.Im
     return _make_qr_image_with_logo(qr_text=qr_text, box_size=box_size, border=border, logo_path=None)
 
 
-def _make_qr_image_with_logo(
-    *,
-    qr_text: str,
-    box_size: int = 8,
-    border: int = 1,
+@dataclass(frozen=True)
+class QrPlan:
+    # Encoding settings shared by every label of a run. version=None keeps the per-label
+    # fit search (used when the rows cannot be scanned up front).
+    version: Optional[int]
+    error_correction: int
+    # QR encoder backend; None uses the process default (see set_qr_encoder).
+    encoder: Optional[str] = None
+
+
+def _error_correction_for(logo_path: Optional[str], logo_scale: float) -> int:
+    if not (logo_path and os.path.exists(logo_path)):
+        return qrcode.constants.ERROR_CORRECT_M
+    # The logo tile (logo plus 12% padding per side) hides about this share of the modules;
+    # keep 2.5x that in reserve for print defects and wear.
+    needed = 2.5 * (logo_scale * 1.24) ** 2
+    if needed <= 0.15:
+        return qrcode.constants.ERROR_CORRECT_M
+    if needed <= 0.25:
+        return qrcode.constants.ERROR_CORRECT_Q
+    return qrcode.constants.ERROR_CORRECT_H
+
+
+def plan_qr_batch(
+    texts: Optional[Iterable[str]],
     logo_path: Optional[str] = None,
     logo_scale: float = 0.22,
-) -> Image.Image:
+) -> QrPlan:
+    # One pass over the QR texts picks the smallest version that fits the longest one in
+    # byte mode (an upper bound for numeric/alphanumeric data), so every label of the run
+    # gets the same module grid and the encoder skips its fit search.
+    ec = _error_correction_for(logo_path, logo_scale)
+    # Fixed in the plan so worker processes of one job use the same backend.
+    encoder = qr_encoder_name()
+    if texts is None:
+        return QrPlan(version=None, error_correction=ec, encoder=encoder)
+    longest = max((len(t.encode("utf-8")) for t in texts), default=0)
+    return QrPlan(version=_byte_mode_version(longest, ec), error_correction=ec, encoder=encoder)
+
+
+def _plan_qr_longest(longest: int, logo_path: Optional[str] = None, logo_scale: float = 0.22) -> QrPlan:
+    # plan_qr_batch for a caller that already tracks the longest QR text (in UTF-8 bytes).
+    ec = _error_correction_for(logo_path, logo_scale)
+    return QrPlan(version=_byte_mode_version(longest, ec), error_correction=ec, encoder=qr_encoder_name())
+
+
+def _byte_mode_version(length: int, ec: int) -> Optional[int]:
+    limits = qrcode.util.BIT_LIMIT_TABLE[ec]
+    for version in range(1, 41):
+        bits = 4 + (8 if version < 10 else 16) + 8 * length
+        if bits <= limits[version]:
+            return version
+    return None
+
+
+def _plan_for(labels: Iterable[LabelRow], logo_path: Optional[str], logo_scale: float) -> QrPlan:
+    # Sequences (lists, MappedTxtLabels, ...) can be scanned first; one-shot iterators cannot.
+    if isinstance(labels, Sequence):
+        return plan_qr_batch((r.qr_text for r in labels), logo_path, logo_scale)
+    return plan_qr_batch(None, logo_path, logo_scale)
+
+
+_QR_ALNUM = frozenset("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:")
+_REPORT_EXAMPLES = 5
+
+
+def _qr_bits_v40(text: str) -> int:
+    # Bits of a single-segment encoding in the mode qrcode picks for the whole text, with the
+    # count field lengths of versions 27-40.
+    n = len(text)
+    if text.isascii() and text.isdigit():
+        return 4 + 14 + 10 * (n // 3) + (0, 4, 7)[n % 3]
+    if all(ch in _QR_ALNUM for ch in text):
+        return 4 + 13 + 11 * (n // 2) + 6 * (n % 2)
+    return 4 + 16 + 8 * len(text.encode("utf-8"))
+
+
+@dataclass
+class ValidationReport:
+    rows: int = 0
+    labels: int = 0
+    error_correction: int = qrcode.constants.ERROR_CORRECT_H
+    # 1-based row numbers in the parsed order.
+    too_long: List[int] = field(default_factory=list)
+    empty_qr: List[int] = field(default_factory=list)
+    empty_names: List[int] = field(default_factory=list)
+    # qr_text -> rows using it, only for texts used by more than one row.
+    duplicates: Dict[str, List[int]] = field(default_factory=dict)
+    # cins -> printed labels (copies included).
+    per_cins: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def errors(self) -> List[str]:
+        out: List[str] = []
+        if self.too_long:
+            out.append(f"{len(self.too_long)} kayıtta QR metni sığmıyor ({_examples(self.too_long)})")
+        if self.empty_qr:
+            out.append(f"{len(self.empty_qr)} kayıtta QR metni boş ({_examples(self.empty_qr)})")
+        return out
+
+    @property
+    def warnings(self) -> List[str]:
+        out: List[str] = []
+        if self.empty_names:
+            out.append(f"{len(self.empty_names)} kayıtta halı adı boş ({_examples(self.empty_names)})")
+        if self.duplicates:
+            text, rows = next(iter(self.duplicates.items()))
+            out.append(f"{len(self.duplicates)} QR metni tekrar ediyor (ör. {text}: {_examples(rows)})")
+        return out
+
+    @property
+    def ok(self) -> bool:
+        return not self.too_long and not self.empty_qr
+
+    def summary(self) -> str:
+        lines = [f"{self.rows} kayıt, {self.labels} etiket"]
+        lines += ["HATA: " + e for e in self.errors]
+        lines += ["Uyarı: " + w for w in self.warnings]
+        if self.per_cins:
+            lines.append(", ".join(f"{c}: {n}" for c, n in sorted(self.per_cins.items())))
+        return "\n".join(lines)
+
+
+def _examples(rows: List[int]) -> str:
+    shown = ", ".join(str(r) for r in rows[:_REPORT_EXAMPLES])
+    return f"satır {shown}" + (", …" if len(rows) > _REPORT_EXAMPLES else "")
+
+
+def validate_labels(
+    labels: Iterable[LabelRow],
+    logo_path: Optional[str] = None,
+    logo_scale: float = 0.22,
+    error_correction: Optional[int] = None,
+) -> ValidationReport:
+    # One pass over the parsed rows, without encoding any QR code. Capacity is checked
+    # against version 40 at the error correction the render will use (see plan_qr_batch).
+    ec = _error_correction_for(logo_path, logo_scale) if error_correction is None else error_correction
+    limit = qrcode.util.BIT_LIMIT_TABLE[ec][40]
+    # Texts this short fit in byte mode even at 4 UTF-8 bytes per character.
+    safe_chars = (limit - 20) // 32
+    report = ValidationReport(error_correction=ec)
+    first_row: Dict[str, int] = {}
+    per_cins = report.per_cins
+    rows = 0
+    total = 0
+    for rows, r in enumerate(labels, 1):
+        q = r.qr_text
+        total += r.quantity
+        per_cins[r.cins] = per_cins.get(r.cins, 0) + r.quantity
+        if not q:
+            report.empty_qr.append(rows)
+        elif len(q) > safe_chars and _qr_bits_v40(q) > limit:
+            report.too_long.append(rows)
+        if not r.carpet_name:
+            report.empty_names.append(rows)
+        first = first_row.setdefault(q, rows)
+        if first != rows:
+            dup = report.duplicates.get(q)
+            if dup is None:
+                report.duplicates[q] = [first, rows]
+            else:
+                dup.append(rows)
+    report.rows = rows
+    report.labels = total
+    return report
+
+
+def _build_qr(qr_text: str, box_size: int = 8, border: int = 1, plan: Optional[QrPlan] = None) -> qrcode.QRCode:
+    if plan is not None and plan.version is not None:
+        qr = qrcode.QRCode(
+            version=plan.version,
+            error_correction=plan.error_correction,
+            box_size=box_size,
+            border=border,
+        )
+        # Single segment, so the data never needs more bits than the plan allowed for.
+        qr.add_data(qr_text, optimize=0)
+        qr.make(fit=False)
+        return qr
+
     qr = qrcode.QRCode(
         version=None,
-        error_correction=qrcode.constants.ERROR_CORRECT_H,
+        error_correction=plan.error_correction if plan is not None else qrcode.constants.ERROR_CORRECT_H,
         box_size=box_size,
         border=border,
     )
     qr.add_data(qr_text)
     qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    if hasattr(img, "convert"):
-        img = img.convert("RGB")
+    return qr
+
+
+class _QrcodeEncoder:
+    # Reference backend; always available.
+    name = "qrcode"
+
+    def modules(self, qr_text: str, plan: Optional[QrPlan]) -> Sequence:
+        return _build_qr(qr_text, border=0, plan=plan).get_matrix()
+
+
+class _SegnoEncoder:
+    name = "segno"
+    _ERRORS = {
+        qrcode.constants.ERROR_CORRECT_L: "L",
+        qrcode.constants.ERROR_CORRECT_M: "M",
+        qrcode.constants.ERROR_CORRECT_Q: "Q",
+        qrcode.constants.ERROR_CORRECT_H: "H",
+    }
+
+    def modules(self, qr_text: str, plan: Optional[QrPlan]) -> Sequence:
+        ec = plan.error_correction if plan is not None else qrcode.constants.ERROR_CORRECT_H
+        qr = segno.make(
+            qr_text,
+            error=self._ERRORS[ec],
+            version=plan.version if plan is not None else None,
+            # Same bytes as the qrcode backend (segno prefers ISO-8859-1 when it fits) and
+            # the planned error correction level, not a boosted one.
+            encoding="utf-8",
+            boost_error=False,
+            micro=False,
+        )
+        return qr.matrix
+
+
+# name -> backend; a backend returns the module matrix without quiet zone, rows of 0/1 or
+# bools, dark = truthy.
+_QR_ENCODERS = {"qrcode": _QrcodeEncoder()}
+if segno is not None:
+    _QR_ENCODERS["segno"] = _SegnoEncoder()
+
+_QR_ENCODER: Optional[str] = None
+_QR_ENCODER_LOCK = threading.Lock()
+# "auto" takes the first installed backend of this list instead of timing them at start-up:
+# backends draw different (equally valid) matrices for the same text, so the choice must not
+# depend on benchmark noise. segno is listed first because it measured faster (--qr-bench).
+_QR_ENCODER_PREFERENCE = ("segno", "qrcode")
+_QR_BENCH_TEXTS = ("HALI:klasik-yolluk-80x150", "KILIM:ÇİÇEKLİ-ŞÖNİL-120x180", "HALI:urun-000123456")
+
+
+def available_qr_encoders() -> List[str]:
+    return list(_QR_ENCODERS)
+
+
+def benchmark_qr_encoders(rounds: int = 5, texts: Iterable[str] = _QR_BENCH_TEXTS) -> Dict[str, float]:
+    # Best-of-rounds seconds per encoded code, on a fixed plan as in a real run.
+    import time
+
+    texts = list(texts)
+    ec = qrcode.constants.ERROR_CORRECT_M
+    plan = QrPlan(_byte_mode_version(max(len(t.encode("utf-8")) for t in texts), ec), ec)
+    out: Dict[str, float] = {}
+    for name, enc in _QR_ENCODERS.items():
+        best = float("inf")
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            for t in texts:
+                enc.modules(t, plan)
+            best = min(best, time.perf_counter() - t0)
+        out[name] = best / len(texts)
+    return out
+
+
+def _resolve_qr_encoder(name: str) -> str:
+    if name == "auto":
+        return next(n for n in _QR_ENCODER_PREFERENCE if n in _QR_ENCODERS)
+    if name not in _QR_ENCODERS:
+        raise ValueError(f"QR kodlayıcı bulunamadı: {name} (kurulu: {', '.join(_QR_ENCODERS)})")
+    return name
+
+
+def set_qr_encoder(name: str = "auto") -> str:
+    # "auto" picks the first installed backend in _QR_ENCODER_PREFERENCE.
+    global _QR_ENCODER
+    name = _resolve_qr_encoder(name)
+    with _QR_ENCODER_LOCK:
+        _QR_ENCODER = name
+        _qr_png.cache_clear()
+    return name
+
+
+def qr_encoder_name() -> str:
+    # Resolved under the lock, so threads starting their first job agree on one backend.
+    global _QR_ENCODER
+    with _QR_ENCODER_LOCK:
+        if _QR_ENCODER is None:
+            _QR_ENCODER = _resolve_qr_encoder("auto")
+        return _QR_ENCODER
+
+
+def _qr_modules(qr_text: str, plan: Optional[QrPlan]) -> Sequence:
+    name = plan.encoder if plan is not None and plan.encoder else qr_encoder_name()
+    return _QR_ENCODERS[name].modules(qr_text, plan)
+
+
+def _qr_matrix(qr_text: str, border: int = 1, plan: Optional[QrPlan] = None) -> List[List[bool]]:
+    # Module matrix including the quiet zone; True is a dark module.
+    modules = _qr_modules(qr_text, plan)
+    n = len(modules)
+    blank = [False] * (n + 2 * border)
+    out = [list(blank) for _ in range(border)]
+    for row in modules:
+        out.append([False] * border + [bool(v) for v in row] + [False] * border)
+    out.extend(list(blank) for _ in range(border))
+    return out
+
+
+def _make_qr_bitmap(qr_text: str, box_size: int = 8, border: int = 1, plan: Optional[QrPlan] = None) -> Image.Image:
+    # 1-bit ("1" mode) QR image, without logo; one pixel per module, then scaled up.
+    matrix = _qr_matrix(qr_text, border=border, plan=plan)
+    n = len(matrix)
+    img = Image.frombytes("L", (n, n), bytes(0 if v else 255 for row in matrix for v in row)).convert("1")
+    if box_size != 1:
+        img = img.resize((n * box_size, n * box_size), Image.Resampling.NEAREST)
+    return img
 
-    if logo_path and os.path.exists(logo_path):
-        try:
-            logo = Image.open(logo_path)
-            if hasattr(logo, "convert"):
-                logo = logo.convert("RGBA")
 
-            w, h = img.size
-            target = int(min(w, h) * logo_scale)
-            if target > 0:
-                logo.thumbnail((target, target), Image.Resampling.LANCZOS)
+def _make_qr_image_with_logo(
+    *,
+    qr_text: str,
+    box_size: int = 8,
+    border: int = 1,
+    logo_path: Optional[str] = None,
+    logo_scale: float = 0.22,
+    plan: Optional[QrPlan] = None,
+) -> Image.Image:
+    img = _make_qr_bitmap(qr_text, box_size=box_size, border=border, plan=plan).convert("RGB")
+    return _paste_logo(img, logo_path, logo_scale)
 
-            lw, lh = logo.size
-            pad = max(2, int(target * 0.12))
-            bg = Image.new("RGBA", (lw + 2 * pad, lh + 2 * pad), (255, 255, 255, 255))
-            bg.paste(logo, (pad, pad), logo)
 
-            x = (w - bg.size[0]) // 2
-            y = (h - bg.size[1]) // 2
+def _paste_logo(img: Image.Image, logo_path: Optional[str], logo_scale: float) -> Image.Image:
+    if logo_path and os.path.exists(logo_path):
+        try:
+            w, h = img.size
+            tile = _logo_tile(os.path.abspath(logo_path), os.stat(logo_path).st_mtime_ns, int(min(w, h) * logo_scale))
+            x = (w - tile.size[0]) // 2
+            y = (h - tile.size[1]) // 2
             img_rgba = img.convert("RGBA")
-            img_rgba.paste(bg, (x, y), bg)
+            img_rgba.paste(tile, (x, y), tile)
             img = img_rgba.convert("RGB")
         except Exception:
             pass
     return img
 
 
+@functools.lru_cache(maxsize=16)
+def _load_logo(path: str, mtime_ns: int) -> Image.Image:
+    with Image.open(path) as logo:
+        return logo.convert("RGBA")
+
+
+@functools.lru_cache(maxsize=64)
+def _logo_tile(path: str, mtime_ns: int, target: int) -> Image.Image:
+    # The logo scaled to the QR size on a white padded background; the QR version (and so
+    # the target size) rarely changes within a run, so this is decoded and resized once.
+    logo = _load_logo(path, mtime_ns).copy()
+    if target > 0:
+        logo.thumbnail((target, target), Image.Resampling.LANCZOS)
+
+    lw, lh = logo.size
+    pad = max(2, int(target * 0.12))
+    bg = Image.new("RGBA", (lw + 2 * pad, lh + 2 * pad), (255, 255, 255, 255))
+    bg.paste(logo, (pad, pad), logo)
+    return bg
+
+
+@functools.lru_cache(maxsize=1024)
+def _qr_png(
+    qr_text: str, box_size: int, border: int, logo_path: Optional[str], logo_scale: float, plan: Optional[QrPlan]
+) -> bytes:
+    qr_img = _make_qr_image_with_logo(
+        qr_text=qr_text, box_size=box_size, border=border, logo_path=logo_path, logo_scale=logo_scale, plan=plan
+    )
+    bio = BytesIO()
+    qr_img.save(bio, format="PNG")
+    return bio.getvalue()
+
+
+def _qr_image_reader(
+    qr_text: str,
+    box_size: int = 8,
+    border: int = 1,
+    logo_path: Optional[str] = None,
+    logo_scale: float = 0.22,
+    plan: Optional[QrPlan] = None,
+) -> ImageReader:
+    return ImageReader(BytesIO(_qr_png(qr_text, box_size, border, logo_path, logo_scale, plan)))
+
+
+class _BilevelImageXObject(pdfdoc.PDFImageXObject):
+    # 1 bit per pixel, Flate-compressed. ReportLab would expand it to 8-bit RGB and ASCII85.
+    def __init__(self, name: str, img: Image.Image) -> None:
+        super().__init__(name)
+        img = img.convert("1")
+        self.width, self.height = img.size
+        self.bitsPerComponent = 1
+        self.colorSpace = "DeviceGray"
+        self.streamContent = zlib.compress(img.tobytes())
+        self._filters = ("FlateDecode",)
+        self.mask = None
+
+
+def _draw_xobject(c: Canvas, name: str, build, x: float, y: float, w: float, h: float) -> None:
+    # Same bookkeeping as Canvas.drawImage, but with a caller-built image object that is
+    # created only the first time `name` is drawn in this document.
+    reg_name = c._doc.getXObjectName(name)
+    if reg_name not in c._doc.idToObject:
+        obj = build(name)
+        c._doc.Reference(obj, reg_name)
+        c._doc.addForm(name, obj)
+    c._currentPageHasImages = 1
+    c.saveState()
+    c.translate(x, y)
+    c.scale(w, h)
+    c._code.append("/%s Do" % reg_name)
+    c.restoreState()
+    c._formsinuse.append(name)
+
+
+def _draw_qr_compact(
+    c: Canvas,
+    qr_text: str,
+    x: float,
+    y: float,
+    size: float,
+    box_size: int = 8,
+    border: int = 1,
+    logo_path: Optional[str] = None,
+    logo_scale: float = 0.22,
+    plan: Optional[QrPlan] = None,
+) -> None:
+    bitmap = _make_qr_bitmap(qr_text, box_size=box_size, border=border, plan=plan)
+    w, h = bitmap.size
+    # Same-size codes differ only in content; a 32-bit checksum would collide within a job.
+    digest = hashlib.blake2b(bitmap.tobytes(), digest_size=16).hexdigest()
+    _draw_xobject(
+        c,
+        "qr1b_%s_%dx%d" % (digest, w, h),
+        lambda name: _BilevelImageXObject(name, bitmap),
+        x,
+        y,
+        size,
+        size,
+    )
+
+    if logo_path and os.path.exists(logo_path):
+        try:
+            path = os.path.abspath(logo_path)
+            mtime_ns = os.stat(logo_path).st_mtime_ns
+            target = int(min(w, h) * logo_scale)
+            tile = _logo_tile(path, mtime_ns, target)
+        except Exception:
+            return
+        tw, th = tile.size
+        px = size / w
+        # The tile sits centred in pixel space; PDF y grows upwards.
+        tx = (w - tw) // 2
+        ty = (h - th) // 2
+        _draw_xobject(
+            c,
+            "qrlogo_%08x_%d" % (zlib.crc32(("%s|%d" % (path, mtime_ns)).encode("utf-8")) & 0xFFFFFFFF, target),
+            lambda name: pdfdoc.PDFImageXObject(name, ImageReader(tile.convert("RGB"))),
+            x + tx * px,
+            y + (h - ty - th) * px,
+            tw * px,
+            th * px,
+        )
+
+
+def warm_up(logo_paths: Iterable[str] = ()) -> str:
+    # Registers the label font, picks the QR encoder and decodes the given logos so the
+    # first job of a long-running process does not pay for them. Returns the font name in use.
+    font_name = _try_register_ttf_font() or "Helvetica"
+    qr_encoder_name()
+    for path in logo_paths:
+        if path and os.path.exists(path):
+            _load_logo(os.path.abspath(path), os.stat(path).st_mtime_ns)
+    return font_name
+
+
 def _wrap_text(canvas: Canvas, text: str, x: float, y: float, max_width: float, line_height: float) -> float:
     words = (text or "").split()
     if not words:
@@ -259,118 +1233,425 @@ def _turkish_upper(s: str) -> str:
     return s.upper()
 
 
+_OUTPUT_CHUNK = 64 * 1024
+
+
+def _write_chunks(output: BinaryIO, data: bytes) -> None:
+    # Streams (stdout, sockets, pipes to lp/gzip) get a finished document in flushed chunks,
+    # so no single huge write has to go through. The whole document is built first; output
+    # that starts before the last page is drawn needs segment_pages.
+    view = memoryview(data)
+    flush = getattr(output, "flush", None)
+    for i in range(0, len(view), _OUTPUT_CHUNK):
+        output.write(view[i : i + _OUTPUT_CHUNK])
+        if flush is not None:
+            flush()
+
+
+def linearize_available() -> bool:
+    return pikepdf is not None or shutil.which("qpdf") is not None
+
+
+def _linearize_file(src: str, dst: str) -> None:
+    # Linearized ("fast web view") layout puts page one and its resources first, with a hint
+    # table, so viewers show and print it before the rest has loaded. Object and xref streams
+    # replace the classic 20-byte-per-object xref table of very long documents.
+    if pikepdf is not None:
+        with pikepdf.open(src) as pdf:
+            pdf.save(
+                dst,
+                linearize=True,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                compress_streams=True,
+            )
+        return
+    qpdf = shutil.which("qpdf")
+    if qpdf is None:
+        raise RuntimeError("Doğrusallaştırılmış PDF için pikepdf veya qpdf gerekli")
+    proc = subprocess.run(
+        [qpdf, "--linearize", "--object-streams=generate", "--compress-streams=y", src, dst],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    # Exit code 3 means the output was written with warnings.
+    if proc.returncode not in (0, 3):
+        raise RuntimeError("qpdf hatası: " + proc.stderr.decode("utf-8", errors="replace").strip())
+
+
+def _emit_pdf(output: Union[str, BinaryIO], write: Callable[[BinaryIO], None], linearize: bool = False) -> None:
+    # write(f) produces the document into f.
+    if not linearize:
+        if hasattr(output, "write"):
+            write(output)
+        else:
+            with open(output, "wb") as f:
+                write(f)
+        return
+
+    if not linearize_available():
+        raise RuntimeError("Doğrusallaştırılmış PDF için pikepdf veya qpdf gerekli")
+    tmp_dir = tempfile.mkdtemp(prefix="etiket_")
+    try:
+        src = os.path.join(tmp_dir, "src.pdf")
+        with open(src, "wb") as f:
+            write(f)
+        if not hasattr(output, "write"):
+            _linearize_file(src, output)
+            return
+        dst = os.path.join(tmp_dir, "out.pdf")
+        _linearize_file(src, dst)
+        with open(dst, "rb") as f:
+            flush = getattr(output, "flush", None)
+            while True:
+                chunk = f.read(_OUTPUT_CHUNK)
+                if not chunk:
+                    break
+                output.write(chunk)
+                if flush is not None:
+                    flush()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _save_canvas(c: Canvas, output: Union[str, BinaryIO], linearize: bool = False) -> None:
+    if not linearize and not hasattr(output, "write"):
+        c.save()
+        return
+    _emit_pdf(output, lambda f: _write_chunks(f, c.getpdfdata()), linearize)
+
+
+_PDF_REF = re.compile(rb"(?<![\d.])(\d+) 0 R\b")
+_PDF_PARENT = re.compile(rb"/Parent\s+\d+ 0 R\b")
+_PDF_STREAM = re.compile(rb"\bstream\r?\n")
+
+
+def _pdf_object_spans(data: bytes) -> Tuple[Dict[int, Tuple[int, int]], int]:
+    # Body spans (between "obj" and "endobj") of a PDF written by ReportLab, which always
+    # uses a classic xref table, and the number of its catalog.
+    startxref = int(data[data.rindex(b"startxref") + 9 :].split()[0])
+    xref = data.index(b"xref", startxref) + 4
+    trailer = data.index(b"trailer", xref)
+    fields = data[xref:trailer].split()
+    offsets: List[Tuple[int, int]] = []
+    i = 0
+    while i < len(fields):
+        first, count = int(fields[i]), int(fields[i + 1])
+        i += 2
+        for k in range(count):
+            if fields[i + 2] == b"n":
+                offsets.append((int(fields[i]), first + k))
+            i += 3
+    offsets.sort()
+    spans: Dict[int, Tuple[int, int]] = {}
+    for (off, num), end in zip(offsets, [o for o, _ in offsets[1:]] + [startxref]):
+        spans[num] = (data.index(b"obj", off) + 3, data.rindex(b"endobj", off, end))
+    root = int(re.search(rb"/Root\s+(\d+) 0 R", data[trailer:]).group(1))
+    return spans, root
+
+
+class _SegmentedPdfWriter:
+    # Concatenates complete ReportLab documents (segments of a few hundred pages) into one
+    # PDF while they are produced. Every segment's page objects and what they reference are
+    # renumbered and written out at once; only the xref entries (spooled to a temp file)
+    # and one Pages node per segment are kept until close(). Objects 1 and 2 are reserved
+    # for the catalog and the root Pages node, which are written last.
+
+    def __init__(self, output: BinaryIO) -> None:
+        self._out = output
+        self._flush = getattr(output, "flush", None)
+        self._pos = 0
+        self._next = 3
+        self._xref = tempfile.TemporaryFile()
+        self._nodes: List[int] = []
+        self.page_count = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data: bytes) -> None:
+        self._out.write(data)
+        self._pos += len(data)
+
+    def _object(self, body: bytes) -> None:
+        # Objects are written in number order, so the spooled entries are the xref table.
+        self._xref.write(b"%010d 00000 n \n" % self._pos)
+        self._write(b"%d 0 obj\n" % self._next + body.strip(b"\r\n") + b"\nendobj\n")
+        self._next += 1
+
+    def add_document(self, data: bytes) -> None:
+        spans, root = _pdf_object_spans(data)
+
+        def head(num: int) -> bytes:
+            a, b = spans[num]
+            m = _PDF_STREAM.search(data, a, b)
+            return data[a : m.start() if m else b]
+
+        pages = int(re.search(rb"/Pages\s+(\d+) 0 R", head(root)).group(1))
+        kids = [int(n) for n in _PDF_REF.findall(re.search(rb"/Kids\s*\[(.*?)\]", head(pages), re.S).group(1))]
+
+        # Everything the pages use, without walking back up through /Parent.
+        used = set(kids)
+        stack = list(kids)
+        while stack:
+            for ref in _PDF_REF.findall(_PDF_PARENT.sub(b"", head(stack.pop()))):
+                num = int(ref)
+                if num not in used:
+                    used.add(num)
+                    stack.append(num)
+
+        node = self._next
+        ordered = sorted(used)
+        mapping = {pages: node}
+        for i, num in enumerate(ordered, node + 1):
+            mapping[num] = i
+
+        def renumber(m: "re.Match") -> bytes:
+            return b"%d 0 R" % mapping[int(m.group(1))]
+
+        kid_refs = b" ".join(b"%d 0 R" % mapping[k] for k in kids)
+        self._object(b"<< /Type /Pages /Count %d /Kids [ %s ] /Parent 2 0 R >>" % (len(kids), kid_refs))
+        for num in ordered:
+            a, b = spans[num]
+            m = _PDF_STREAM.search(data, a, b)
+            split = m.start() if m else b
+            self._object(_PDF_REF.sub(renumber, data[a:split]) + data[split:b])
+
+        self._nodes.append(node)
+        self.page_count += len(kids)
+        if self._flush is not None:
+            self._flush()
+
+    def close(self) -> None:
+        catalog = self._pos
+        self._write(b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R /PageMode /UseNone >>\nendobj\n")
+        root = self._pos
+        kids = b" ".join(b"%d 0 R" % n for n in self._nodes)
+        self._write(b"2 0 obj\n<< /Type /Pages /Count %d /Kids [ %s ] >>\nendobj\n" % (self.page_count, kids))
+
+        startxref = self._pos
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % self._next)
+        self._write(b"%010d 00000 n \n%010d 00000 n \n" % (catalog, root))
+        self._xref.seek(0)
+        while True:
+            chunk = self._xref.read(_OUTPUT_CHUNK)
+            if not chunk:
+                break
+            self._write(chunk)
+        self._xref.close()
+        self._write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (self._next, startxref))
+        if self._flush is not None:
+            self._flush()
+
+
+def _segments(labels: Iterable[LabelRow], size: int) -> Iterator[List[LabelRow]]:
+    # Chunks holding exactly `size` printed labels (copies included); a row whose copies
+    # straddle a boundary is split, so segment pages are always full.
+    chunk: List[LabelRow] = []
+    room = size
+    for row in labels:
+        left = row.quantity
+        while left > 0:
+            take = min(left, room)
+            chunk.append(row if take == row.quantity else replace(row, quantity=take))
+            left -= take
+            room -= take
+            if room == 0:
+                yield chunk
+                chunk = []
+                room = size
+    if chunk:
+        yield chunk
+
+
+def _write_segmented(
+    labels: Iterable[LabelRow],
+    per_segment: int,
+    render: Callable[[List[LabelRow], BinaryIO], None],
+    output: Union[str, BinaryIO],
+    linearize: bool,
+) -> None:
+    def write(f: BinaryIO) -> None:
+        writer = _SegmentedPdfWriter(f)
+        for chunk in _segments(labels, per_segment):
+            buf = BytesIO()
+            render(chunk, buf)
+            writer.add_document(buf.getvalue())
+        writer.close()
+
+    _emit_pdf(output, write, linearize)
+
+
 def generate_labels_pdf(
     labels: Iterable[LabelRow],
-    output_pdf_path: str,
+    output_pdf_path: Union[str, BinaryIO],
     width_mm: float = 80.0,
     height_mm: float = 50.0,
     qr_mm: float = 32.0,
     margin_mm: float = 4.0,
     logo_path: Optional[str] = None,
     logo_scale: float = 0.22,
+    compact_images: bool = False,
+    qr_plan: Optional[QrPlan] = None,
+    linearize: bool = False,
+    segment_pages: int = 0,
 ) -> None:
+    if segment_pages > 0:
+        # Bounded memory: render segment_pages pages at a time and stream them out.
+        render = functools.partial(
+            generate_labels_pdf,
+            width_mm=width_mm,
+            height_mm=height_mm,
+            qr_mm=qr_mm,
+            margin_mm=margin_mm,
+            logo_path=logo_path,
+            logo_scale=logo_scale,
+            compact_images=compact_images,
+            qr_plan=qr_plan or _plan_for(labels, logo_path, logo_scale),
+        )
+        _write_segmented(labels, segment_pages, render, output_pdf_path, linearize)
+        return
+
     page_w = width_mm * mm
     page_h = height_mm * mm
     qr_size = qr_mm * mm
     margin = margin_mm * mm
 
-    c = Canvas(output_pdf_path, pagesize=(page_w, page_h))
-    font_name = _try_register_ttf_font() or "Helvetica"
-    font_name_bold = font_name
-
-    for row in labels:
-        qr_img = _make_qr_image_with_logo(qr_text=row.qr_text, logo_path=logo_path, logo_scale=logo_scale)
-        bio = BytesIO()
-        qr_img.save(bio, format="PNG")
-        bio.seek(0)
-        qr_reader = ImageReader(bio)
-
-        qr_x = page_w - margin - qr_size
-        qr_y = margin + (6 * mm)
-        c.drawImage(qr_reader, qr_x, qr_y, width=qr_size, height=qr_size, preserveAspectRatio=True, mask='auto')
-
-        text_x = margin
-        text_y_top = page_h - margin - 8
-        text_max_w = qr_x - margin - text_x
-
-        c.setFont(font_name_bold, 12)
-        c.drawString(text_x, text_y_top, (row.cins or "").strip())
-
-        c.setFont(font_name, 10)
-        _wrap_text(c, _turkish_upper((row.carpet_name or "").strip()), text_x, text_y_top - 16, text_max_w, 12)
-
-        c.setFont(font_name, 8)
-        _wrap_text(c, (row.qr_text or "").strip(), text_x, margin + 10, text_max_w, 10)
-
-        c.showPage()
+    with _RenderContext() as ctx:
+        c = Canvas(output_pdf_path, pagesize=(page_w, page_h))
+        font_name = ctx.font_name
+        font_name_bold = font_name
+        plan = qr_plan or _plan_for(labels, logo_path, logo_scale)
+
+        def draw(row: LabelRow) -> None:
+            qr_x = page_w - margin - qr_size
+            qr_y = margin + (6 * mm)
+            if compact_images:
+                _draw_qr_compact(
+                    c, row.qr_text, qr_x, qr_y, qr_size, logo_path=logo_path, logo_scale=logo_scale, plan=plan
+                )
+            else:
+                qr_reader = _qr_image_reader(row.qr_text, logo_path=logo_path, logo_scale=logo_scale, plan=plan)
+                c.drawImage(qr_reader, qr_x, qr_y, width=qr_size, height=qr_size, preserveAspectRatio=True, mask='auto')
+
+            text_x = margin
+            text_y_top = page_h - margin - 8
+            text_max_w = qr_x - margin - text_x
+
+            c.setFont(font_name_bold, 12)
+            c.drawString(text_x, text_y_top, (row.cins or "").strip())
+
+            c.setFont(font_name, 10)
+            _wrap_text(c, _turkish_upper((row.carpet_name or "").strip()), text_x, text_y_top - 16, text_max_w, 12)
+
+            c.setFont(font_name, 8)
+            _wrap_text(c, (row.qr_text or "").strip(), text_x, margin + 10, text_max_w, 10)
+
+        # Labels printed more than once are drawn into a form XObject; every copy is then a
+        # page that only references it.
+        forms: Dict[Tuple[str, str, str], str] = {}
+        for row in labels:
+            if row.quantity == 1:
+                draw(row)
+                c.showPage()
+                continue
+            if row.quantity <= 0:
+                continue
+            key = (row.cins, row.carpet_name, row.qr_text)
+            name = forms.get(key)
+            if name is None:
+                name = forms[key] = f"label{len(forms)}"
+                c.beginForm(name, 0, 0, page_w, page_h)
+                draw(row)
+                c.endForm()
+            for _ in range(row.quantity):
+                c.doForm(name)
+                c.showPage()
 
-    c.save()
+        _save_canvas(c, output_pdf_path, linearize=linearize)
 
 
 def generate_qr_list_pdf(
     labels: Iterable[LabelRow],
-    output_pdf_path: str,
+    output_pdf_path: Union[str, BinaryIO],
     cols: int = 4,
     rows: int = 12,
     margin_mm: float = 8.0,
     gap_mm: float = 2.0,
     logo_path: Optional[str] = None,
     logo_scale: float = 0.22,
+    compact_images: bool = False,
+    qr_plan: Optional[QrPlan] = None,
+    linearize: bool = False,
+    segment_pages: int = 0,
 ) -> None:
     page_w, page_h = A4
     if cols <= 0 or rows <= 0:
         raise ValueError("cols ve rows pozitif olmalı")
+    if segment_pages > 0:
+        render = functools.partial(
+            generate_qr_list_pdf,
+            cols=cols,
+            rows=rows,
+            margin_mm=margin_mm,
+            gap_mm=gap_mm,
+            logo_path=logo_path,
+            logo_scale=logo_scale,
+            compact_images=compact_images,
+            qr_plan=qr_plan or _plan_for(labels, logo_path, logo_scale),
+        )
+        _write_segmented(labels, segment_pages * cols * rows, render, output_pdf_path, linearize)
+        return
     margin = margin_mm * mm
     gap = gap_mm * mm
 
     cell_w = (page_w - 2 * margin - (cols - 1) * gap) / cols
     cell_h = (page_h - 2 * margin - (rows - 1) * gap) / rows
 
-    c = Canvas(output_pdf_path, pagesize=A4)
-    font_name = _try_register_ttf_font() or "Helvetica"
-
-    def _truncate(text: str, max_w: float, suffix: str = "…") -> str:
-        t = (text or "").strip()
-        if not t:
-            return ""
-        if c.stringWidth(t) <= max_w:
-            return t
-        while t and c.stringWidth(t + suffix) > max_w:
-            t = t[:-1]
-        return (t + suffix) if t else ""
-
-    items = list(labels)
-    per_page = cols * rows
-    page_count = (len(items) + per_page - 1) // per_page
-
-    for pidx in range(page_count):
-        start = pidx * per_page
-        chunk = items[start : start + per_page]
-
-        for i, row in enumerate(chunk):
-            r = i // cols
-            col = i % cols
-
-            x0 = margin + col * (cell_w + gap)
-            y0 = page_h - margin - (r + 1) * cell_h - r * gap
-
-            inner = 2.0 * mm
+    with _RenderContext() as ctx:
+        c = Canvas(output_pdf_path, pagesize=A4)
+        font_name = ctx.font_name
+
+        def _truncate(text: str, max_w: float, suffix: str = "…") -> str:
+            t = (text or "").strip()
+            if not t:
+                return ""
+            if c.stringWidth(t) <= max_w:
+                return t
+            while t and c.stringWidth(t + suffix) > max_w:
+                t = t[:-1]
+            return (t + suffix) if t else ""
+
+        # Rows are consumed one at a time, so query cursors and other iterators stream through.
+        plan = qr_plan or _plan_for(labels, logo_path, logo_scale)
+        per_page = cols * rows
+        inner = 2.0 * mm
+
+        qr_side = min(cell_h - 2 * inner, (cell_w * 0.46))
+        qr_side = max(qr_side, 12 * mm)
+        qr_side = min(qr_side, cell_w - 2 * inner)
+
+        def draw_cell(row: LabelRow, x0: float, y0: float) -> None:
             c.setLineWidth(0.6)
             c.rect(x0, y0, cell_w, cell_h)
 
-            qr_side = min(cell_h - 2 * inner, (cell_w * 0.46))
-            qr_side = max(qr_side, 12 * mm)
-            qr_side = min(qr_side, cell_w - 2 * inner)
-
-            qr_img = _make_qr_image_with_logo(qr_text=row.qr_text, box_size=6, border=1, logo_path=logo_path, logo_scale=logo_scale)
-            bio = BytesIO()
-            qr_img.save(bio, format="PNG")
-            bio.seek(0)
-            qr_reader = ImageReader(bio)
-
             qr_x = x0 + cell_w - inner - qr_side
             qr_y = y0 + (cell_h - qr_side) / 2
-            c.drawImage(qr_reader, qr_x, qr_y, width=qr_side, height=qr_side, preserveAspectRatio=True, mask='auto')
+            if compact_images:
+                _draw_qr_compact(
+                    c,
+                    row.qr_text,
+                    qr_x,
+                    qr_y,
+                    qr_side,
+                    box_size=6,
+                    border=1,
+                    logo_path=logo_path,
+                    logo_scale=logo_scale,
+                    plan=plan,
+                )
+            else:
+                qr_reader = _qr_image_reader(
+                    row.qr_text, box_size=6, border=1, logo_path=logo_path, logo_scale=logo_scale, plan=plan
+                )
+                c.drawImage(qr_reader, qr_x, qr_y, width=qr_side, height=qr_side, preserveAspectRatio=True, mask='auto')
 
             text_x = x0 + inner
             text_max_w = max(10, (qr_x - inner) - text_x)
@@ -392,9 +1673,40 @@ def generate_qr_list_pdf(
             bottom_txt = _truncate((row.qr_text or "").strip(), text_max_w)
             c.drawString(text_x, y0 + inner + 2, bottom_txt)
 
-        c.showPage()
+        # Cells of a label with several copies reuse one form XObject drawn at the origin.
+        forms: Dict[Tuple[str, str, str], str] = {}
+        i = 0
+        for row in labels:
+            name = None
+            if row.quantity > 1:
+                key = (row.cins, row.carpet_name, row.qr_text)
+                name = forms.get(key)
+                if name is None:
+                    name = forms[key] = f"cell{len(forms)}"
+                    c.beginForm(name, 0, 0, cell_w, cell_h)
+                    draw_cell(row, 0, 0)
+                    c.endForm()
+
+            for _ in range(row.quantity):
+                if i and i % per_page == 0:
+                    c.showPage()
+                r = (i % per_page) // cols
+                col = i % cols
+                x0 = margin + col * (cell_w + gap)
+                y0 = page_h - margin - (r + 1) * cell_h - r * gap
+                if name is None:
+                    draw_cell(row, x0, y0)
+                else:
+                    c.saveState()
+                    c.translate(x0, y0)
+                    c.doForm(name)
+                    c.restoreState()
+                i += 1
+
+        if i:
+            c.showPage()
 
-    c.save()
+        _save_canvas(c, output_pdf_path, linearize=linearize)
 
 
 def default_output_pdf(input_path: str) -> str:
@@ -406,16 +1718,68 @@ def main_cli(argv: Optional[List[str]] = None) -> int:
     import argparse
 
     p = argparse.ArgumentParser(prog="label_qr_pdf")
-    p.add_argument("input", help=".txt veya .csv")
-    p.add_argument("--out", default=None, help="Çıktı PDF yolu")
+    p.add_argument("input", nargs="?", help=".txt veya .csv")
+    p.add_argument(
+        "--out",
+        default=None,
+        help="Çıktı PDF yolu (-: standart çıktı; ilk baytlar PDF bitmeden gelsin diye --segment-pages ile kullanın)",
+    )
     p.add_argument("--width", type=float, default=80.0, help="Etiket genişliği (mm)")
     p.add_argument("--height", type=float, default=50.0, help="Etiket yüksekliği (mm)")
-    p.add_argument("--encoding", default="utf-8", help="Dosya encoding")
+    p.add_argument("--encoding", default="auto", help="Dosya encoding (auto: BOM/örnekten tespit)")
+    p.add_argument("--workers", type=int, default=1, help="Büyük CSV için paralel okuma işlemi sayısı (0: tüm çekirdekler)")
+    p.add_argument("--compact", action="store_true", help="QR kodları 1-bit görüntü olarak göm (daha küçük PDF)")
+    p.add_argument("--linearize", action="store_true", help="Hızlı web görünümü (doğrusallaştırılmış) PDF üret")
+    p.add_argument(
+        "--segment-pages",
+        type=int,
+        default=0,
+        help="Sabit bellekle yaz: her seferde bu kadar sayfa üret ve diske aktar (0: kapalı)",
+    )
+    p.add_argument("--check", action="store_true", help="Sadece kayıtları denetle, PDF üretme")
+    p.add_argument("--strict", action="store_true", help="Uyarılarda da (boş ad, tekrar eden QR) dur")
+    p.add_argument(
+        "--qr-encoder",
+        default="auto",
+        help=f"QR kodlayıcı: auto (kurulu olanlardan {'/'.join(_QR_ENCODER_PREFERENCE)} sırasıyla) veya {', '.join(available_qr_encoders())}",
+    )
+    p.add_argument("--qr-bench", action="store_true", help="Kurulu QR kodlayıcıları ölç ve çık")
     args = p.parse_args(argv)
 
-    labels = read_labels(args.input, encoding=args.encoding)
+    if args.qr_encoder != "auto" and args.qr_encoder not in available_qr_encoders():
+        p.error(f"QR kodlayıcı bulunamadı: {args.qr_encoder}")
+    if args.qr_bench:
+        timings = benchmark_qr_encoders()
+        for name, sec in timings.items():
+            print(f"{name}\t{sec * 1000:.2f} ms/kod")
+        fastest = min(timings, key=timings.get)
+        print(f"en hızlı: {fastest} (sabitlemek için --qr-encoder {fastest})")
+        print(f"seçilen: {set_qr_encoder(args.qr_encoder)}")
+        return 0
+    if not args.input:
+        p.error("input gerekli")
+    set_qr_encoder(args.qr_encoder)
+
+    labels = read_labels(args.input, encoding=args.encoding, workers=args.workers)
+    report = validate_labels(labels)
+    if args.check or not report.ok or (args.strict and report.warnings):
+        print(report.summary(), file=sys.stderr)
+    if not report.ok or (args.strict and report.warnings):
+        return 2
+    if args.check:
+        return 0
     out = args.out or default_output_pdf(args.input)
-    generate_labels_pdf(labels, out, width_mm=args.width, height_mm=args.height)
+    if out == "-":
+        out = sys.stdout.buffer
+    generate_labels_pdf(
+        labels,
+        out,
+        width_mm=args.width,
+        height_mm=args.height,
+        compact_images=args.compact,
+        linearize=args.linearize,
+        segment_pages=args.segment_pages,
+    )
     return 0
 
 
@@ -0,0 +1,317 @@
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from label_qr_pdf import LabelRow, generate_labels_pdf, generate_qr_list_pdf, plan_qr_batch, read_labels
+
+
+log = logging.getLogger("label_scheduler")
+
+
+def estimate_cost(row: LabelRow) -> float:
+    # Relative render time, measured on the label PDF: about 3.5 ms per page plus 0.12 ms per
+    # QR byte; extra copies only reference the first rendering (about 0.3 ms each).
+    return 1.0 + len(row.qr_text.encode("utf-8")) / 30.0 + 0.08 * max(0, row.quantity - 1)
+
+
+@dataclass
+class Batch:
+    index: int
+    labels: List[LabelRow]
+    cost: float
+    pdf_path: Optional[str] = None
+    target: Optional[str] = None
+    attempts: int = 0
+
+    @property
+    def label_count(self) -> int:
+        return sum(r.quantity for r in self.labels)
+
+
+def split_batches(labels: Sequence[LabelRow], parts: int, max_labels: int = 0) -> List[Batch]:
+    # Contiguous batches of roughly equal estimated cost, so every printer gets a run of
+    # consecutive labels. max_labels (counting copies) splits further, which lets faster
+    # printers pick up more batches.
+    if parts <= 0:
+        raise ValueError("parts pozitif olmalı")
+    costs = [estimate_cost(r) for r in labels]
+    total = sum(costs)
+    if max_labels > 0:
+        count = sum(r.quantity for r in labels)
+        parts = max(parts, -(-count // max_labels))
+    parts = max(1, min(parts, len(labels)))
+    target = total / parts
+
+    batches: List[Batch] = []
+    start = 0
+    acc = 0.0
+    acc_labels = 0
+    done = 0.0
+    for i, (row, cost) in enumerate(zip(labels, costs)):
+        over_labels = max_labels > 0 and acc_labels + row.quantity > max_labels and i > start
+        if over_labels or (i > start and done + acc + cost / 2 > target * (len(batches) + 1)):
+            batches.append(Batch(len(batches), list(labels[start:i]), acc))
+            done += acc
+            start, acc, acc_labels = i, 0.0, 0
+        acc += cost
+        acc_labels += row.quantity
+    if start < len(labels):
+        batches.append(Batch(len(batches), list(labels[start:]), acc))
+    return batches
+
+
+class DirectoryTarget:
+    # A spool/hot folder watched by a printer. Files appear complete (written, then renamed).
+
+    def __init__(self, path: str, name: Optional[str] = None) -> None:
+        self.path = path
+        self.name = name or os.path.basename(os.path.normpath(path)) or path
+
+    def send(self, pdf_path: str, file_name: str) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        part = os.path.join(self.path, "." + file_name + ".part")
+        shutil.copyfile(pdf_path, part)
+        os.replace(part, os.path.join(self.path, file_name))
+
+
+class CommandTarget:
+    # A print command such as ["lp", "-d", "zebra1"]. "{pdf}" in an argument is replaced by
+    # the file; otherwise the file is appended. A non-zero exit status is a failure.
+
+    def __init__(self, argv: Sequence[str], name: Optional[str] = None, timeout: float = 300.0) -> None:
+        if not argv:
+            raise ValueError("Komut boş olamaz")
+        self.argv = list(argv)
+        self.name = name or " ".join(self.argv)
+        self.timeout = timeout
+
+    def send(self, pdf_path: str, file_name: str) -> None:
+        if any("{pdf}" in a for a in self.argv):
+            argv = [a.replace("{pdf}", pdf_path) for a in self.argv]
+        else:
+            argv = self.argv + [pdf_path]
+        proc = subprocess.run(
+            argv,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=self.timeout,
+        )
+        if proc.returncode != 0:
+            err = proc.stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"Komut {proc.returncode} ile bitti: {err}")
+
+
+@dataclass
+class TargetStats:
+    name: str
+    batches: int = 0
+    labels: int = 0
+    bytes: int = 0
+    busy_seconds: float = 0.0
+    failures: int = 0
+    failed: bool = False
+
+    @property
+    def labels_per_second(self) -> float:
+        return self.labels / self.busy_seconds if self.busy_seconds > 0 else 0.0
+
+
+@dataclass
+class JobReport:
+    batches: List[Batch]
+    targets: Dict[str, TargetStats]
+    undelivered: List[Batch] = field(default_factory=list)
+    # Kept only when something was not delivered, so the PDFs can be recovered.
+    work_dir: Optional[str] = None
+    seconds: float = 0.0
+
+
+def _render_batch(kind: str, rows: List[Tuple[str, str, str, int]], out_path: str, options: Dict[str, object]) -> int:
+    labels = [LabelRow(*t) for t in rows]
+    if kind == "list":
+        generate_qr_list_pdf(labels, out_path, **options)
+    else:
+        generate_labels_pdf(labels, out_path, **options)
+    return os.path.getsize(out_path)
+
+
+class LabelScheduler:
+    # Splits a job into batches, renders them in a process pool and hands finished PDFs to
+    # one dispatcher thread per target. Targets pull from a shared queue, so a fast printer
+    # simply takes more batches. A target that fails max_failures times is taken out and
+    # its batch goes back on the queue for the others.
+
+    def __init__(
+        self,
+        targets: Sequence,
+        workers: int = 2,
+        kind: str = "labels",
+        options: Optional[Dict[str, object]] = None,
+        max_failures: int = 2,
+    ) -> None:
+        if not targets:
+            raise ValueError("En az bir hedef gerekli")
+        if workers <= 0 or max_failures <= 0:
+            raise ValueError("workers ve max_failures pozitif olmalı")
+        if kind not in ("labels", "list"):
+            raise ValueError("kind 'labels' veya 'list' olmalı")
+        names = [t.name for t in targets]
+        if len(set(names)) != len(names):
+            raise ValueError("Hedef adları benzersiz olmalı")
+        self.targets = list(targets)
+        self.workers = workers
+        self.kind = kind
+        self.options = dict(options or {})
+        self.max_failures = max_failures
+
+    def run(
+        self,
+        labels: Sequence[LabelRow],
+        job_name: str = "etiket",
+        batches_per_target: int = 1,
+        max_labels: int = 0,
+    ) -> JobReport:
+        t_start = time.monotonic()
+        batches = split_batches(labels, len(self.targets) * max(1, batches_per_target), max_labels)
+        # One QR plan for the whole job keeps the module size equal across batches.
+        options = dict(self.options)
+        if "qr_plan" not in options:
+            options["qr_plan"] = plan_qr_batch(
+                (r.qr_text for r in labels), options.get("logo_path"), options.get("logo_scale", 0.22)
+            )
+        stats = {t.name: TargetStats(t.name) for t in self.targets}
+        ready: "queue.Queue[Optional[Batch]]" = queue.Queue()
+        cond = threading.Condition()
+        state = {"pending": len(batches), "alive": len(self.targets)}
+        work_dir = tempfile.mkdtemp(prefix="etiket_is_")
+
+        def serve(target) -> None:
+            st = stats[target.name]
+            while True:
+                batch = ready.get()
+                if batch is None:
+                    return
+                name = f"{job_name}_{batch.index + 1:03d}.pdf"
+                t0 = time.monotonic()
+                try:
+                    target.send(batch.pdf_path, name)
+                except Exception as e:
+                    batch.attempts += 1
+                    with cond:
+                        st.failures += 1
+                        st.busy_seconds += time.monotonic() - t0
+                        log.warning("%s: %s gönderilemedi: %s", target.name, name, e)
+                        ready.put(batch)
+                        if st.failures >= self.max_failures:
+                            st.failed = True
+                            state["alive"] -= 1
+                            cond.notify_all()
+                            return
+                    continue
+                with cond:
+                    batch.target = target.name
+                    st.batches += 1
+                    st.labels += batch.label_count
+                    st.bytes += os.path.getsize(batch.pdf_path)
+                    st.busy_seconds += time.monotonic() - t0
+                    state["pending"] -= 1
+                    cond.notify_all()
+                log.info("%s -> %s (%d etiket)", name, target.name, batch.label_count)
+
+        threads = [threading.Thread(target=serve, args=(t,), daemon=True) for t in self.targets]
+        for th in threads:
+            th.start()
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = {}
+                for b in batches:
+                    b.pdf_path = os.path.join(work_dir, f"{job_name}_{b.index + 1:03d}.pdf")
+                    rows = [(r.cins, r.carpet_name, r.qr_text, r.quantity) for r in b.labels]
+                    futures[pool.submit(_render_batch, self.kind, rows, b.pdf_path, options)] = b
+                # Batches are dispatched as soon as they are rendered, not in index order.
+                for fut in as_completed(futures):
+                    fut.result()
+                    ready.put(futures[fut])
+            with cond:
+                cond.wait_for(lambda: state["pending"] == 0 or state["alive"] == 0)
+        finally:
+            for _ in threads:
+                ready.put(None)
+            for th in threads:
+                th.join()
+
+        undelivered = [b for b in batches if b.target is None]
+        if undelivered:
+            log.error("%d parti hiçbir hedefe gönderilemedi (%s)", len(undelivered), work_dir)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return JobReport(
+            batches=batches,
+            targets=stats,
+            undelivered=undelivered,
+            work_dir=work_dir if undelivered else None,
+            seconds=time.monotonic() - t_start,
+        )
+
+
+def _parse_target(spec: str):
+    # "dir:PATH" or "cmd:COMMAND ARGS..."; a bare value is a directory.
+    kind, sep, value = spec.partition(":")
+    if sep and kind == "cmd":
+        import shlex
+
+        return CommandTarget(shlex.split(value))
+    if sep and kind == "dir":
+        return DirectoryTarget(value)
+    return DirectoryTarget(spec)
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    p = argparse.ArgumentParser(prog="label_scheduler")
+    p.add_argument("input", help=".txt veya .csv")
+    p.add_argument(
+        "--target",
+        action="append",
+        required=True,
+        help="Hedef: dir:KLASÖR veya cmd:'lp -d yazıcı' (tekrarlanabilir)",
+    )
+    p.add_argument("--workers", type=int, default=2, help="Eşzamanlı render işlemi sayısı")
+    p.add_argument("--batches-per-target", type=int, default=1, help="Hedef başına parti sayısı")
+    p.add_argument("--max-labels", type=int, default=0, help="Parti başına en fazla etiket (0: sınırsız)")
+    p.add_argument("--list", action="store_true", help="A4 liste PDF üret")
+    p.add_argument("--compact", action="store_true", help="QR kodları 1-bit görüntü olarak göm")
+    p.add_argument("--encoding", default="auto", help="Dosya encoding")
+    args = p.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    labels = read_labels(args.input, encoding=args.encoding)
+    if not labels:
+        print("Dosyada etiket verisi bulunamadı")
+        return 1
+
+    scheduler = LabelScheduler(
+        [_parse_target(t) for t in args.target],
+        workers=args.workers,
+        kind="list" if args.list else "labels",
+        options={"compact_images": args.compact},
+    )
+    job_name = os.path.splitext(os.path.basename(args.input))[0]
+    report = scheduler.run(labels, job_name, batches_per_target=args.batches_per_target, max_labels=args.max_labels)
+    for st in report.targets.values():
+        state = "HATALI" if st.failed else "ok"
+        print(f"{st.name}\t{st.batches} parti\t{st.labels} etiket\t{st.labels_per_second:.1f} etiket/sn\t{state}")
+    return 1 if report.undelivered else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_cli())
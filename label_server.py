@@ -0,0 +1,403 @@
+import json
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from label_qr_pdf import (
+    LabelRow,
+    _parse_txt_line,
+    _row_from_json,
+    generate_labels_pdf,
+    generate_qr_list_pdf,
+    qr_encoder_name,
+    set_qr_encoder,
+    warm_up,
+)
+
+
+_STREAM_CHUNK = 64 * 1024
+# Chunks a worker may run ahead of a slow client before it waits.
+_STREAM_QUEUE_CHUNKS = 16
+_MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+def _as_bool(value: object) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "evet", "on")
+    return bool(value)
+
+
+def _positive(conv: Callable[[object], float]) -> Callable[[object], float]:
+    def convert(value: object) -> float:
+        v = conv(value)
+        if not 0 < v < float("inf"):
+            raise ValueError(value)
+        return v
+
+    return convert
+
+
+def _non_negative(conv: Callable[[object], float]) -> Callable[[object], float]:
+    def convert(value: object) -> float:
+        v = conv(value)
+        if not 0 <= v < float("inf"):
+            raise ValueError(value)
+        return v
+
+    return convert
+
+
+# Allowed options per endpoint and how to convert them from JSON/query strings.
+_OPTIONS = {
+    "labels": {
+        "width_mm": _positive(float),
+        "height_mm": _positive(float),
+        "qr_mm": _positive(float),
+        "margin_mm": _non_negative(float),
+        "logo_path": str,
+        "logo_scale": _positive(float),
+        "compact_images": _as_bool,
+        "linearize": _as_bool,
+        "segment_pages": _non_negative(int),
+    },
+    "list": {
+        "cols": _positive(int),
+        "rows": _positive(int),
+        "margin_mm": _non_negative(float),
+        "gap_mm": _non_negative(float),
+        "logo_path": str,
+        "logo_scale": _positive(float),
+        "compact_images": _as_bool,
+        "linearize": _as_bool,
+        "segment_pages": _non_negative(int),
+    },
+}
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+def _warm_worker(logo_paths: Tuple[str, ...], qr_encoder: str) -> None:
+    # The encoder is chosen once in the parent; workers benchmarking side by side could
+    # settle on different backends and return different symbols for the same request.
+    set_qr_encoder(qr_encoder)
+    warm_up(logo_paths)
+
+
+def _ping() -> bool:
+    return True
+
+
+class _QueueWriter:
+    # Output stream of a worker: the PDF goes to the HTTP thread in _STREAM_CHUNK pieces
+    # through a manager queue instead of coming back as one pickled result. With
+    # segment_pages the first pieces leave while later pages are still being drawn.
+
+    def __init__(self, chunks) -> None:
+        self._chunks = chunks
+        self._buf = bytearray()
+
+    def write(self, data) -> int:
+        self._buf += data
+        while len(self._buf) >= _STREAM_CHUNK:
+            self._chunks.put(bytes(self._buf[:_STREAM_CHUNK]))
+            del self._buf[:_STREAM_CHUNK]
+        return len(data)
+
+    def flush(self) -> None:
+        if self._buf:
+            self._chunks.put(bytes(self._buf))
+            self._buf.clear()
+
+
+def _render_job(kind: str, rows: List[Tuple[str, str, str, int]], options: Dict[str, object], chunks) -> None:
+    labels = [LabelRow(*t) for t in rows]
+    out = _QueueWriter(chunks)
+    try:
+        if kind == "list":
+            generate_qr_list_pdf(labels, out, **options)
+        else:
+            generate_labels_pdf(labels, out, **options)
+        out.flush()
+    finally:
+        # End marker; the job's exception, if any, is read from its future.
+        chunks.put(None)
+
+
+def _read_chunks(chunks, fut: Future) -> Iterator[bytes]:
+    while True:
+        try:
+            data = chunks.get(timeout=0.5)
+        except queue.Empty:
+            # The end marker is queued before the job finishes, so a finished job with an
+            # empty queue is a worker that died.
+            if fut.done() and chunks.empty():
+                return
+            continue
+        if data is None:
+            return
+        yield data
+
+
+class RenderService:
+    # A warm process pool shared by all HTTP requests. Each worker registers the font and
+    # decodes the logos once at start-up and keeps its QR/logo caches across jobs.
+
+    def __init__(self, workers: int = 2, max_queue: int = 32, logo_paths: Iterable[str] = ()) -> None:
+        if workers <= 0 or max_queue < 0:
+            raise ValueError("workers pozitif, max_queue negatif olmamalı")
+        self.workers = workers
+        self.max_queue = max_queue
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_warm_worker,
+            initargs=(tuple(logo_paths), qr_encoder_name()),
+        )
+        # Owns the per-request chunk queues shared with the pool workers.
+        self._manager = multiprocessing.Manager()
+        # Spawn every worker now instead of on the first request.
+        for fut in [self._pool.submit(_ping) for _ in range(workers)]:
+            fut.result()
+
+        self._slots = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._labels = 0
+        self._render_seconds = 0.0
+
+    def render(self, kind: str, rows: List[LabelRow], options: Dict[str, object]) -> Iterator[bytes]:
+        # Yields the PDF in chunks as the worker produces it. Queue and option errors are
+        # raised by the first next(), before anything has been sent.
+        with self._lock:
+            if self._queued >= self.max_queue and self._in_flight >= self.workers:
+                self._rejected += 1
+                raise QueueFullError("Sunucu meşgul, kuyruk dolu")
+            self._queued += 1
+
+        with self._slots:
+            with self._lock:
+                self._queued -= 1
+                self._in_flight += 1
+            t0 = time.monotonic()
+            chunks = fut = None
+            finished = False
+            try:
+                payload = [(r.cins, r.carpet_name, r.qr_text, r.quantity) for r in rows]
+                chunks = self._manager.Queue(_STREAM_QUEUE_CHUNKS)
+                fut = self._pool.submit(_render_job, kind, payload, options, chunks)
+                yield from _read_chunks(chunks, fut)
+                fut.result()
+                finished = True
+            except BaseException:
+                with self._lock:
+                    self._failed += 1
+                raise
+            finally:
+                if fut is not None and not finished:
+                    # The client went away: keep the slot until the worker is really free.
+                    for _ in _read_chunks(chunks, fut):
+                        pass
+                with self._lock:
+                    self._in_flight -= 1
+                    self._render_seconds += time.monotonic() - t0
+
+        with self._lock:
+            self._completed += 1
+            self._labels += sum(r.quantity for r in rows)
+
+    def metrics(self) -> Dict[str, object]:
+        with self._lock:
+            done = self._completed + self._failed
+            return {
+                "status": "ok",
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "labels": self._labels,
+                "avg_render_ms": round(1000.0 * self._render_seconds / done, 2) if done else 0.0,
+                "uptime_s": round(time.monotonic() - self._started, 1),
+            }
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        self._manager.shutdown()
+
+
+def _parse_options(kind: str, raw: Dict[str, object]) -> Dict[str, object]:
+    allowed = _OPTIONS[kind]
+    options: Dict[str, object] = {}
+    for key, value in raw.items():
+        conv = allowed.get(key)
+        if conv is None:
+            raise ValueError(f"Bilinmeyen ayar: {key}")
+        if value is None or value == "":
+            continue
+        try:
+            options[key] = conv(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Geçersiz değer: {key}") from None
+    return options
+
+
+def _parse_json_body(body: bytes) -> Tuple[List[LabelRow], Dict[str, object]]:
+    doc = json.loads(body.decode("utf-8"))
+    if not isinstance(doc, dict) or not isinstance(doc.get("labels"), list):
+        raise ValueError("JSON gövdesinde 'labels' listesi olmalı")
+    rows: List[LabelRow] = []
+    for item in doc["labels"]:
+        row = _row_from_json(item)
+        if row is not None:
+            rows.append(row)
+    options = {k: v for k, v in doc.items() if k != "labels"}
+    return rows, options
+
+
+def _parse_text_body(body: bytes) -> List[LabelRow]:
+    rows: List[LabelRow] = []
+    for line in body.decode("utf-8", errors="replace").splitlines():
+        row = _parse_txt_line(line)
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service: RenderService
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _send_json(self, status: int, doc: Dict[str, object]) -> None:
+        data = json.dumps(doc, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        path = urlparse(self.path).path
+        if path in ("/health", "/metrics"):
+            self._send_json(200, self.service.metrics())
+            return
+        self._send_json(404, {"error": "Bulunamadı"})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        kind = url.path.strip("/")
+        if kind not in _OPTIONS:
+            self._send_json(404, {"error": "Bulunamadı"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send_json(400, {"error": "Geçersiz Content-Length"})
+            return
+        if length > _MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"error": "İstek çok büyük"})
+            return
+        body = self.rfile.read(length)
+
+        try:
+            if (self.headers.get("Content-Type") or "").startswith("application/json"):
+                rows, raw = _parse_json_body(body)
+            else:
+                rows = _parse_text_body(body)
+                raw = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            options = _parse_options(kind, raw)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        if not rows:
+            self._send_json(400, {"error": "Etiket verisi bulunamadı"})
+            return
+
+        stream = self.service.render(kind, rows, options)
+        try:
+            first = next(stream, b"")
+        except QueueFullError as e:
+            self._send_json(503, {"error": str(e)})
+            return
+        except ValueError as e:
+            # Raised by the generators for option values they cannot lay out.
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+
+        # The length is not known until the worker is done, so the body is chunked.
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self._write_chunk(first)
+            for data in stream:
+                self._write_chunk(data)
+            self.wfile.write(b"0\r\n\r\n")
+        except Exception:
+            # Headers are out; closing without the last chunk marks the PDF as incomplete.
+            self.close_connection = True
+        finally:
+            stream.close()
+
+    def _write_chunk(self, data: bytes) -> None:
+        if data:
+            self.wfile.write(b"%X\r\n%s\r\n" % (len(data), data))
+
+
+def make_server(service: RenderService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    # port=0 picks a free port; read it back from server.server_address.
+    handler = type("LabelHandler", (_Handler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    p = argparse.ArgumentParser(prog="label_server")
+    p.add_argument("--host", default="127.0.0.1", help="Dinlenecek adres")
+    p.add_argument("--port", type=int, default=8765, help="Dinlenecek port")
+    p.add_argument("--workers", type=int, default=2, help="Sıcak tutulan render işlemi sayısı")
+    p.add_argument("--max-queue", type=int, default=32, help="Bekleyebilecek en fazla istek")
+    p.add_argument("--logo", action="append", default=[], help="Önceden yüklenecek logo (tekrarlanabilir)")
+    args = p.parse_args(argv)
+
+    service = RenderService(workers=args.workers, max_queue=args.max_queue, logo_paths=args.logo)
+    server = make_server(service, host=args.host, port=args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_cli())
@@ -0,0 +1,273 @@
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from label_qr_pdf import (
+    LabelRow,
+    QrPlan,
+    _row_from_json,
+    generate_labels_pdf,
+    generate_qr_list_pdf,
+    iter_labels,
+    plan_qr_batch,
+    read_labels,
+)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalogs (
+    name TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    imported_at REAL NOT NULL,
+    row_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS labels (
+    catalog TEXT NOT NULL,
+    row_no INTEGER NOT NULL,
+    cins TEXT NOT NULL,
+    carpet_name TEXT NOT NULL,
+    qr_text TEXT NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (catalog, row_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS labels_cins ON labels (cins, catalog, row_no);
+CREATE INDEX IF NOT EXISTS labels_qr_text ON labels (qr_text);
+"""
+
+_INSERT_BATCH = 10000
+_FETCH_BATCH = 2000
+
+
+def iter_labels_from_jsonl(path: str) -> Iterator[LabelRow]:
+    # One JSON value per line, in the same shapes the HTTP service accepts.
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = _row_from_json(json.loads(line))
+            except ValueError as e:
+                raise ValueError(f"{os.path.basename(path)}:{line_no}: {e}") from None
+            if row is not None:
+                yield row
+
+
+def _parse_row_range(text: str) -> Tuple[int, int]:
+    # "12000-12500" (inclusive) or a single row number.
+    a, sep, b = text.partition("-")
+    try:
+        first = int(a)
+        last = int(b) if sep else first
+    except ValueError:
+        raise ValueError(f"Geçersiz satır aralığı: {text}") from None
+    if first <= 0 or last < first:
+        raise ValueError(f"Geçersiz satır aralığı: {text}")
+    return first, last
+
+
+class LabelStore:
+    # Catalogs imported once into an indexed SQLite file. Rows keep their 1-based position
+    # in the source file (row_no), so "rows 12000-12500" or "all HALI rows" of a catalog are
+    # index range scans, and results are streamed from the cursor instead of loaded.
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def import_rows(self, rows: Iterable[LabelRow], catalog: str, source: str = "") -> int:
+        # Replaces the catalog in one transaction; readers keep seeing the old rows until commit.
+        count = 0
+        with self._conn:
+            self._conn.execute("DELETE FROM labels WHERE catalog = ?", (catalog,))
+            batch: List[Tuple[str, int, str, str, str, int]] = []
+            for count, r in enumerate(rows, 1):
+                batch.append((catalog, count, r.cins, r.carpet_name, r.qr_text, r.quantity))
+                if len(batch) >= _INSERT_BATCH:
+                    self._conn.executemany("INSERT INTO labels VALUES (?, ?, ?, ?, ?, ?)", batch)
+                    batch = []
+            if batch:
+                self._conn.executemany("INSERT INTO labels VALUES (?, ?, ?, ?, ?, ?)", batch)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO catalogs VALUES (?, ?, ?, ?)",
+                (catalog, source, time.time(), count),
+            )
+        return count
+
+    def import_file(
+        self,
+        path: str,
+        catalog: Optional[str] = None,
+        encoding: str = "auto",
+        workers: int = 1,
+    ) -> int:
+        catalog = catalog or os.path.splitext(os.path.basename(path))[0]
+        if path.lower().endswith(".jsonl"):
+            rows: Iterable[LabelRow] = iter_labels_from_jsonl(path)
+        elif workers != 1:
+            # The parallel CSV parser returns the whole catalog as a list.
+            rows = read_labels(path, encoding=encoding, workers=workers)
+        else:
+            # Streamed into the batched inserts; memory does not grow with the catalog.
+            rows = iter_labels(path, encoding=encoding)
+        return self.import_rows(rows, catalog, source=os.path.abspath(path))
+
+    def catalogs(self) -> List[Tuple[str, int, float]]:
+        return self._conn.execute("SELECT name, row_count, imported_at FROM catalogs ORDER BY name").fetchall()
+
+    def drop_catalog(self, catalog: str) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM labels WHERE catalog = ?", (catalog,))
+            self._conn.execute("DELETE FROM catalogs WHERE name = ?", (catalog,))
+
+    def _where(
+        self,
+        catalog: Optional[str],
+        cins: Optional[str],
+        qr_text: Optional[str],
+        rows: Optional[Tuple[int, int]],
+    ) -> Tuple[str, List[object]]:
+        terms: List[str] = []
+        args: List[object] = []
+        if catalog is not None:
+            terms.append("catalog = ?")
+            args.append(catalog)
+        if cins is not None:
+            terms.append("cins = ?")
+            args.append(cins)
+        if qr_text is not None:
+            terms.append("qr_text = ?")
+            args.append(qr_text)
+        if rows is not None:
+            terms.append("row_no BETWEEN ? AND ?")
+            args.extend(rows)
+        return (" WHERE " + " AND ".join(terms)) if terms else "", args
+
+    def query(
+        self,
+        catalog: Optional[str] = None,
+        cins: Optional[str] = None,
+        qr_text: Optional[str] = None,
+        rows: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[LabelRow]:
+        where, args = self._where(catalog, cins, qr_text, rows)
+        cur = self._conn.execute(
+            "SELECT cins, carpet_name, qr_text, quantity FROM labels" + where + " ORDER BY catalog, row_no", args
+        )
+        while True:
+            batch = cur.fetchmany(_FETCH_BATCH)
+            if not batch:
+                return
+            for t in batch:
+                yield LabelRow(*t)
+
+    def count(
+        self,
+        catalog: Optional[str] = None,
+        cins: Optional[str] = None,
+        qr_text: Optional[str] = None,
+        rows: Optional[Tuple[int, int]] = None,
+    ) -> int:
+        where, args = self._where(catalog, cins, qr_text, rows)
+        return self._conn.execute("SELECT COUNT(*) FROM labels" + where, args).fetchone()[0]
+
+    def plan(
+        self,
+        catalog: Optional[str] = None,
+        cins: Optional[str] = None,
+        qr_text: Optional[str] = None,
+        rows: Optional[Tuple[int, int]] = None,
+        logo_path: Optional[str] = None,
+        logo_scale: float = 0.22,
+    ) -> QrPlan:
+        # The QR version plan only depends on the longest text, which SQLite finds without
+        # handing every row to Python.
+        where, args = self._where(catalog, cins, qr_text, rows)
+        longest = self._conn.execute(
+            "SELECT qr_text FROM labels" + where + " ORDER BY length(CAST(qr_text AS BLOB)) DESC LIMIT 1", args
+        ).fetchone()
+        return plan_qr_batch([longest[0]] if longest else [], logo_path, logo_scale)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "LabelStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    p = argparse.ArgumentParser(prog="label_store")
+    p.add_argument("--db", default="etiketler.db", help="SQLite dosyası")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    pi = sub.add_parser("import", help="Katalog dosyasını içe aktar (.txt/.csv/.jsonl)")
+    pi.add_argument("input", help="Katalog dosyası")
+    pi.add_argument("--catalog", default=None, help="Katalog adı (varsayılan: dosya adı)")
+    pi.add_argument("--encoding", default="auto", help="Dosya encoding")
+    pi.add_argument("--workers", type=int, default=1, help="Büyük CSV için paralel okuma işlemi sayısı")
+
+    sub.add_parser("list", help="Katalogları listele")
+
+    pp = sub.add_parser("print", help="Seçilen satırlardan PDF üret")
+    pp.add_argument("--catalog", default=None, help="Katalog adı")
+    pp.add_argument("--cins", default=None, help="Sadece bu cins")
+    pp.add_argument("--qr", default=None, help="Sadece bu QR metni")
+    pp.add_argument("--rows", default=None, help="Satır aralığı, örn. 12000-12500")
+    pp.add_argument("--out", required=True, help="Çıktı PDF yolu (-: standart çıktı)")
+    pp.add_argument("--list", action="store_true", help="A4 liste PDF üret")
+    pp.add_argument("--compact", action="store_true", help="QR kodları 1-bit görüntü olarak göm")
+    pp.add_argument("--linearize", action="store_true", help="Hızlı web görünümü (doğrusallaştırılmış) PDF üret")
+    pp.add_argument("--segment-pages", type=int, default=0, help="Sabit bellekle yaz: parça başına sayfa (0: kapalı)")
+    args = p.parse_args(argv)
+    row_range = None
+    if args.cmd == "print" and args.rows:
+        try:
+            row_range = _parse_row_range(args.rows)
+        except ValueError as e:
+            p.error(str(e))
+
+    with LabelStore(args.db) as store:
+        if args.cmd == "import":
+            n = store.import_file(args.input, catalog=args.catalog, encoding=args.encoding, workers=args.workers)
+            print(f"{n} kayıt içe aktarıldı")
+            return 0
+        if args.cmd == "list":
+            for name, count, _ts in store.catalogs():
+                print(f"{name}\t{count}")
+            return 0
+
+        where = dict(
+            catalog=args.catalog,
+            cins=args.cins,
+            qr_text=args.qr,
+            rows=row_range,
+        )
+        if not store.count(**where):
+            print("Seçime uyan kayıt yok", file=sys.stderr)
+            return 1
+        out = sys.stdout.buffer if args.out == "-" else args.out
+        gen = generate_qr_list_pdf if args.list else generate_labels_pdf
+        gen(
+            store.query(**where),
+            out,
+            compact_images=args.compact,
+            qr_plan=store.plan(**where),
+            linearize=args.linearize,
+            segment_pages=args.segment_pages,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_cli())
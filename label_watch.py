@@ -0,0 +1,270 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from label_qr_pdf import (
+    default_output_pdf,
+    generate_labels_pdf,
+    generate_qr_list_pdf,
+    qr_encoder_name,
+    read_labels,
+    set_qr_encoder,
+)
+
+
+log = logging.getLogger("label_watch")
+
+_WATCH_EXTS = (".txt", ".csv")
+
+
+def _write_atomic(render, out_path: str) -> None:
+    # Render next to the target and rename, so the spooler never sees a half-written PDF.
+    # "xb" creates the part file with the umask-respecting default mode, like
+    # DirectoryTarget.send; mkstemp would leave every PDF readable by its owner only.
+    out_dir, name = os.path.split(os.path.abspath(out_path))
+    tmp = os.path.join(out_dir, f".{name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.part")
+    try:
+        with open(tmp, "xb") as f:
+            render(f)
+        os.replace(tmp, out_path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _render_file(
+    path: str,
+    out_path: str,
+    encoding: str,
+    list_pdf: bool,
+    logo_path: Optional[str],
+    logo_scale: float,
+) -> int:
+    labels = read_labels(path, encoding=encoding)
+    if not labels:
+        raise ValueError("Dosyada etiket verisi bulunamadı")
+    if list_pdf:
+        _write_atomic(lambda f: generate_qr_list_pdf(labels, f, logo_path=logo_path, logo_scale=logo_scale), out_path)
+    else:
+        _write_atomic(lambda f: generate_labels_pdf(labels, f, logo_path=logo_path, logo_scale=logo_scale), out_path)
+    return len(labels)
+
+
+class FolderWatcher:
+    # Polls a folder with os.scandir and a (size, mtime) cache. A file is rendered once its
+    # signature has not changed for `settle` seconds, i.e. the ERP has finished writing it.
+    # Polling is used instead of inotify because the drop folder is usually an SMB share,
+    # where change notifications are unreliable.
+
+    def __init__(
+        self,
+        folder: str,
+        out_dir: Optional[str] = None,
+        workers: int = 2,
+        interval: float = 1.0,
+        settle: float = 2.0,
+        encoding: str = "auto",
+        list_pdf: bool = False,
+        logo_path: Optional[str] = None,
+        logo_scale: float = 0.22,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError("workers pozitif olmalı")
+        self.folder = folder
+        self.out_dir = out_dir
+        self.workers = workers
+        self.interval = interval
+        self.settle = settle
+        self.encoding = encoding
+        self.list_pdf = list_pdf
+        self.logo_path = logo_path
+        self.logo_scale = logo_scale
+
+        # One encoder for every worker, chosen here rather than by a benchmark in each.
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=set_qr_encoder,
+            initargs=(qr_encoder_name(),),
+        )
+        self._lock = threading.Lock()
+        # path -> (signature, monotonic time the signature was first seen)
+        self._seen: Dict[str, Tuple[Tuple[int, int], float]] = {}
+        # path -> signature that was rendered (or failed); unchanged files are not retried.
+        self._done: Dict[str, Tuple[int, int]] = {}
+        self._pending: Dict[str, Future] = {}
+        self.rendered = 0
+        self.failed = 0
+
+    def output_path(self, path: str) -> str:
+        out = default_output_pdf(path)
+        if self.list_pdf:
+            out = os.path.splitext(out)[0] + "_liste.pdf"
+        if self.out_dir:
+            out = os.path.join(self.out_dir, os.path.basename(out))
+        return out
+
+    def _up_to_date(self, path: str, st: os.stat_result) -> bool:
+        try:
+            return os.stat(self.output_path(path)).st_mtime_ns >= st.st_mtime_ns
+        except OSError:
+            return False
+
+    def poll_once(self) -> List[str]:
+        now = time.monotonic()
+        submitted: List[str] = []
+        present = set()
+        try:
+            entries = list(os.scandir(self.folder))
+        except OSError as e:
+            log.warning("Klasör okunamadı: %s", e)
+            return submitted
+
+        for entry in entries:
+            if not entry.name.lower().endswith(_WATCH_EXTS) or entry.name.startswith("."):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            path = entry.path
+            present.add(path)
+            sig = (st.st_size, st.st_mtime_ns)
+
+            with self._lock:
+                if path in self._pending or self._done.get(path) == sig:
+                    continue
+                if len(self._pending) >= self.workers * 2:
+                    continue
+
+            prev = self._seen.get(path)
+            if prev is None or prev[0] != sig:
+                self._seen[path] = (sig, now)
+                if self.settle > 0:
+                    continue
+            elif now - prev[1] < self.settle:
+                continue
+
+            if self._up_to_date(path, st):
+                with self._lock:
+                    self._done[path] = sig
+                continue
+
+            out = self.output_path(path)
+            fut = self._pool.submit(
+                _render_file, path, out, self.encoding, self.list_pdf, self.logo_path, self.logo_scale
+            )
+            with self._lock:
+                self._pending[path] = fut
+            fut.add_done_callback(lambda f, p=path, s=sig, o=out: self._finished(p, s, o, f))
+            submitted.append(path)
+
+        for path in list(self._seen):
+            if path not in present:
+                del self._seen[path]
+                with self._lock:
+                    self._done.pop(path, None)
+        return submitted
+
+    def _finished(self, path: str, sig: Tuple[int, int], out: str, fut: Future) -> None:
+        with self._lock:
+            self._pending.pop(path, None)
+            self._done[path] = sig
+            try:
+                count = fut.result()
+            except Exception as e:
+                self.failed += 1
+                log.error("%s: %s", os.path.basename(path), e)
+                return
+            self.rendered += 1
+        log.info("%s -> %s (%d etiket)", os.path.basename(path), out, count)
+
+    def wait_idle(self) -> None:
+        while True:
+            with self._lock:
+                pending = list(self._pending.values())
+            if not pending:
+                return
+            for fut in pending:
+                try:
+                    fut.result()
+                except Exception:
+                    pass
+
+    def run_once(self) -> None:
+        # Renders every file present now. poll_once submits at most workers * 2 at a time,
+        # so keep polling as slots free up until nothing new is found.
+        while True:
+            submitted = self.poll_once()
+            with self._lock:
+                pending = list(self._pending.values())
+            if not pending:
+                if not submitted:
+                    return
+                continue
+            wait(pending, return_when=FIRST_COMPLETED)
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.poll_once()
+            stop.wait(self.interval)
+
+    def close(self) -> None:
+        self.wait_idle()
+        self._pool.shutdown(wait=True)
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    p = argparse.ArgumentParser(prog="label_watch")
+    p.add_argument("folder", help="İzlenecek klasör (.txt/.csv)")
+    p.add_argument("--out-dir", default=None, help="PDF çıktı klasörü (varsayılan: girdinin yanı)")
+    p.add_argument("--workers", type=int, default=2, help="Eşzamanlı render işlemi sayısı")
+    p.add_argument("--interval", type=float, default=1.0, help="Tarama aralığı (sn)")
+    p.add_argument("--settle", type=float, default=2.0, help="Dosyanın değişmeden beklemesi gereken süre (sn)")
+    p.add_argument("--encoding", default="auto", help="Dosya encoding")
+    p.add_argument("--list", action="store_true", help="A4 liste PDF üret")
+    p.add_argument("--logo", default=None, help="Logo dosyası")
+    p.add_argument("--logo-scale", type=float, default=0.22, help="Logo oranı")
+    p.add_argument("--once", action="store_true", help="Bir kez tara, bitince çık")
+    args = p.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    watcher = FolderWatcher(
+        args.folder,
+        out_dir=args.out_dir,
+        workers=args.workers,
+        interval=args.interval,
+        settle=0.0 if args.once else args.settle,
+        encoding=args.encoding,
+        list_pdf=args.list,
+        logo_path=args.logo,
+        logo_scale=args.logo_scale,
+    )
+    try:
+        if args.once:
+            watcher.run_once()
+        else:
+            watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 1 if watcher.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_cli())
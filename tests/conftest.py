@@ -0,0 +1,30 @@
+import os
+import shutil
+import sys
+
+import pytest
+import reportlab
+from reportlab import rl_config
+
+# The modules live at the repository root, next to this folder.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import label_qr_pdf  # noqa: E402
+
+
+@pytest.fixture
+def ttf_font(tmp_path, monkeypatch):
+    # A Fonts folder with ReportLab's bundled Vera as "arial.ttf", picked up through WINDIR,
+    # and a fresh font pool so every test registers and copies the TTF itself.
+    fonts = tmp_path / "Fonts"
+    fonts.mkdir()
+    shutil.copyfile(os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf"), fonts / "arial.ttf")
+    monkeypatch.setenv("WINDIR", str(tmp_path))
+    monkeypatch.setattr(label_qr_pdf, "_FONT_NAME", None)
+    monkeypatch.setattr(label_qr_pdf, "_FONT_PATH", None)
+    monkeypatch.setattr(label_qr_pdf, "_FONT_RESOLVED", False)
+    monkeypatch.setattr(label_qr_pdf, "_FONT_FREE", [])
+    monkeypatch.setattr(label_qr_pdf, "_FONT_COPIES", 0)
+    # No timestamps or random document IDs, so equal jobs give equal bytes.
+    monkeypatch.setattr(rl_config, "invariant", 1)
+    return "arial"
@@ -0,0 +1,66 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import label_qr_pdf
+from label_qr_pdf import LabelRow, generate_labels_pdf, generate_qr_list_pdf
+
+
+def _jobs():
+    jobs = []
+    for i in range(16):
+        rows = [
+            LabelRow(
+                cins="HALI" if j % 2 else "KİLİM",
+                carpet_name=f"ŞÖNİL ÇİÇEKLİ ürün {i}-{j}",
+                qr_text=f"HALI:urun-{i}-{j}",
+                quantity=1 + (j % 3 == 0),
+            )
+            for j in range(12 + i)
+        ]
+        kind = "list" if i % 4 == 3 else "labels"
+        jobs.append((kind, rows, {"compact_images": bool(i % 2)}))
+    return jobs
+
+
+def _render(job) -> bytes:
+    kind, rows, options = job
+    buf = BytesIO()
+    if kind == "list":
+        generate_qr_list_pdf(rows, buf, **options)
+    else:
+        generate_labels_pdf(rows, buf, **options)
+    return buf.getvalue()
+
+
+def test_concurrent_jobs_match_serial_output(ttf_font):
+    jobs = _jobs()
+    serial = [_render(job) for job in jobs]
+    assert label_qr_pdf._FONT_NAME == ttf_font
+    for data in serial:
+        assert b"/FontFile2" in data
+
+    # Switch threads as often as possible so jobs overlap inside font subsetting.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(3):
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                parallel = list(ex.map(_render, jobs))
+            assert parallel == serial
+    finally:
+        sys.setswitchinterval(interval)
+    # Overlapping jobs needed copies of their own, and every copy went back to the pool.
+    assert label_qr_pdf._FONT_COPIES > 1
+    assert len(label_qr_pdf._FONT_FREE) == label_qr_pdf._FONT_COPIES
+
+
+def test_open_render_contexts_hold_distinct_fonts(ttf_font):
+    with label_qr_pdf._RenderContext() as a, label_qr_pdf._RenderContext() as b:
+        assert a.font_name.startswith(ttf_font)
+        assert b.font_name.startswith(ttf_font)
+        assert a.font_name != b.font_name
+    with label_qr_pdf._RenderContext() as c:
+        # Released copies are reused instead of registering new ones.
+        assert c.font_name in (a.font_name, b.font_name)
+    assert label_qr_pdf._FONT_COPIES == 2
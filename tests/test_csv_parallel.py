@@ -0,0 +1,52 @@
+import pytest
+
+import label_qr_pdf
+from label_qr_pdf import iter_labels_from_csv, read_labels_from_csv
+
+
+def _write_catalog(path, rows: int, note) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("cins,carpet_name,qr_text,adet,not\r\n")
+        for i in range(rows):
+            f.write(f'HALI,Klasik {i},HALI:klasik-{i},{1 + i % 3},"{note(i)}"\r\n')
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(label_qr_pdf, "_CSV_PARALLEL_MIN_BYTES", 0)
+
+
+@pytest.mark.parametrize(
+    "note",
+    [
+        lambda i: "tek satır",
+        # ERP note/address cells with line breaks; chunk boundaries land inside some of them.
+        lambda i: "Depo 3\r\nRaf 12\r\nKat " + str(i) if i % 7 else "yok",
+        lambda i: 'adres ""A"" blok\n' * (i % 5),
+    ],
+)
+def test_parallel_matches_sequential(tmp_path, small_chunks, note):
+    path = str(tmp_path / "katalog.csv")
+    _write_catalog(path, 3000, note)
+    expected = list(iter_labels_from_csv(path))
+    assert len(expected) == 3000
+    for workers in (2, 3, 8):
+        assert read_labels_from_csv(path, workers=workers) == expected
+
+
+def test_open_quote_at_boundary_is_detected(tmp_path):
+    path = str(tmp_path / "katalog.csv")
+    _write_catalog(path, 50, lambda i: "satır 1\nsatır 2")
+    params = {
+        "delimiter": ",",
+        "quotechar": '"',
+        "doublequote": True,
+        "skipinitialspace": False,
+        "quoting": 0,
+        "escapechar": None,
+    }
+    cols = label_qr_pdf._resolve_columns(["cins", "carpet_name", "qr_text", "adet", "not"])
+    with open(path, "rb") as f:
+        data = f.read()
+    cut = data.index("satır 2".encode("utf-8"))
+    assert label_qr_pdf._parse_csv_chunk(path, data.index(b"\r\n") + 2, cut, "utf-8", params, cols) is None
@@ -0,0 +1,42 @@
+import random
+
+from label_qr_pdf import LineIndexedLabels
+
+
+def _reference(lines):
+    return LineIndexedLabels("\n".join(lines))
+
+
+def test_edits_match_a_full_parse():
+    rnd = random.Random(7)
+    pool = ["HALI:klasik-80x150", "KILIM:çiçekli-" + "x" * 30, "not a label", "", "HALI:a", "HALI:" + "ğ" * 50]
+    lines = [rnd.choice(pool) for _ in range(200)]
+    labels = LineIndexedLabels("\n".join(lines))
+    assert labels.take_edits() is None
+    for _ in range(300):
+        first = rnd.randrange(len(lines))
+        count = rnd.randrange(0, min(4, len(lines) - first) + 1)
+        new = [rnd.choice(pool) for _ in range(rnd.randrange(0, 4))]
+        if count == 0 and not new:
+            continue
+        shown = labels.rows()
+        before = list(shown)
+        labels.replace_lines(first, count, new)
+        lines[first : first + count] = new
+        ref = _reference(lines)
+        assert labels.rows() == ref.rows()
+        assert labels.longest_qr_bytes == ref.longest_qr_bytes
+        # Earlier results are never mutated; replaying the edits on them gives the new rows.
+        assert shown == before
+        for start, old_count, new_count in labels.take_edits():
+            shown = shown[:start] + labels.rows()[start : start + new_count] + shown[start + old_count :]
+        assert shown == labels.rows()
+
+
+def test_unchanged_rows_are_not_reported():
+    labels = LineIndexedLabels("HALI:a\nyorum\nHALI:b")
+    labels.take_edits()
+    labels.replace_lines(1, 1, ["yorum satırı"])
+    assert labels.take_edits() == []
+    labels.replace_lines(2, 1, ["HALI:bb"])
+    assert labels.take_edits() == [(1, 1, 1)]
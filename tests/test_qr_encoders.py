@@ -0,0 +1,183 @@
+from typing import List, Sequence, Tuple
+
+import pytest
+import qrcode
+
+import label_qr_pdf
+from label_qr_pdf import QrPlan, available_qr_encoders
+
+
+TEXTS = (
+    "HALI:klasik-yolluk-80x150",
+    "KILIM:ÇİÇEKLİ-ŞÖNİL-120x180",
+    "HALI:urun-000123456",
+    "HALI:1234567890123 ABC",
+    "ABC:DEF 12",
+    "12345678",
+    "007",
+    "a",
+    "x" * 300,
+    "KILIM:" + "ğ" * 40,
+)
+LEVELS = (
+    qrcode.constants.ERROR_CORRECT_L,
+    qrcode.constants.ERROR_CORRECT_M,
+    qrcode.constants.ERROR_CORRECT_Q,
+    qrcode.constants.ERROR_CORRECT_H,
+)
+
+
+def _format_info(modules: Sequence) -> Tuple[int, int]:
+    # (error correction, mask) from the format bits next to the top-left finder pattern.
+    n = len(modules)
+    bits = 0
+    for i in range(15):
+        r = i if i < 6 else i + 1 if i < 8 else n - 15 + i
+        if modules[r][8]:
+            bits |= 1 << i
+    data = (bits ^ 0x5412) >> 10
+    return data >> 3, data & 7
+
+
+def read_qr(modules: Sequence) -> Tuple[str, int, int]:
+    # Reads an undamaged symbol back as (text, version, error correction), without error
+    # correction. Function patterns come from an empty symbol laid out the way qrcode does it.
+    n = len(modules)
+    version = (n - 17) // 4
+    ec, mask = _format_info(modules)
+    blank = qrcode.QRCode(version=version, error_correction=ec, border=0)
+    blank.modules_count = n
+    blank.modules = [[None] * n for _ in range(n)]
+    for r, c in ((0, 0), (n - 7, 0), (0, n - 7)):
+        blank.setup_position_probe_pattern(r, c)
+    blank.setup_position_adjust_pattern()
+    blank.setup_timing_pattern()
+    blank.setup_type_info(True, mask)
+    if version >= 7:
+        blank.setup_type_number(True)
+
+    # Data modules in placement order: two-column strips from the right, zig-zagging.
+    mask_func = qrcode.util.mask_func(mask)
+    bits: List[bool] = []
+    row, inc = n - 1, -1
+    for col in range(n - 1, 0, -2):
+        if col <= 6:
+            col -= 1
+        while 0 <= row < n:
+            for c in (col, col - 1):
+                if blank.modules[row][c] is None:
+                    bits.append(bool(modules[row][c]) != bool(mask_func(row, c)))
+            row += inc
+        row -= inc
+        inc = -inc
+    codewords = [int("".join("1" if b else "0" for b in bits[i : i + 8]), 2) for i in range(0, len(bits) - 7, 8)]
+
+    # Undo the block interleaving of the data codewords.
+    blocks = qrcode.base.rs_blocks(version, ec)
+    data: List[List[int]] = [[] for _ in blocks]
+    i = 0
+    for k in range(max(b.data_count for b in blocks)):
+        for j, b in enumerate(blocks):
+            if k < b.data_count:
+                data[j].append(codewords[i])
+                i += 1
+    stream = "".join(format(v, "08b") for block in data for v in block)
+
+    pos = 0
+
+    def take(count: int) -> int:
+        nonlocal pos
+        pos += count
+        return int(stream[pos - count : pos] or "0", 2)
+
+    out = bytearray()
+    while pos + 4 <= len(stream):
+        mode = take(4)
+        if mode == 0:
+            break
+        count = take(qrcode.util.length_in_bits(mode, version))
+        if mode == qrcode.util.MODE_NUMBER:
+            for _ in range(count // 3):
+                out += b"%03d" % take(10)
+            if count % 3:
+                out += b"%0*d" % (count % 3, take((0, 4, 7)[count % 3]))
+        elif mode == qrcode.util.MODE_ALPHA_NUM:
+            for _ in range(count // 2):
+                v = take(11)
+                out += bytes((qrcode.util.ALPHA_NUM[v // 45], qrcode.util.ALPHA_NUM[v % 45]))
+            if count % 2:
+                out.append(qrcode.util.ALPHA_NUM[take(6)])
+        elif mode == qrcode.util.MODE_8BIT_BYTE:
+            out += bytes(take(8) for _ in range(count))
+        else:
+            raise ValueError(f"unsupported mode {mode}")
+    return out.decode("utf-8"), version, ec
+
+
+def test_reader_rejects_damaged_symbol():
+    plan = QrPlan(2, qrcode.constants.ERROR_CORRECT_M, "qrcode")
+    modules = [[bool(v) for v in row] for row in label_qr_pdf._qr_modules("HALI:test-123", plan)]
+    assert read_qr(modules) == ("HALI:test-123", 2, qrcode.constants.ERROR_CORRECT_M)
+    for r in range(12, 20):
+        modules[r][20] = not modules[r][20]
+    # The reader has no error correction, so damage must not read back as the same text.
+    try:
+        text = read_qr(modules)[0]
+    except Exception:
+        text = None
+    assert text != "HALI:test-123"
+
+
+@pytest.mark.parametrize("encoder", available_qr_encoders())
+@pytest.mark.parametrize("ec", LEVELS)
+def test_backend_encodes_planned_symbol(encoder, ec):
+    # Every installed backend must give the same content at the planned version and error
+    # correction. Mask choice and padding bits may differ between backends.
+    for text in TEXTS:
+        version = label_qr_pdf._byte_mode_version(len(text.encode("utf-8")), ec)
+        modules = label_qr_pdf._qr_modules(text, QrPlan(version, ec, encoder))
+        assert read_qr(modules) == (text, version, ec)
+
+
+@pytest.mark.parametrize("encoder", available_qr_encoders())
+@pytest.mark.parametrize("ec", LEVELS)
+def test_backend_fit_search(encoder, ec):
+    # Without a version the backends segment the data their own way; the symbol must still
+    # carry the text and be no larger than the single-segment byte-mode version.
+    for text in TEXTS:
+        limit = label_qr_pdf._byte_mode_version(len(text.encode("utf-8")), ec)
+        got_text, got_version, got_ec = read_qr(label_qr_pdf._qr_modules(text, QrPlan(None, ec, encoder)))
+        assert (got_text, got_ec) == (text, ec)
+        assert got_version <= limit
+
+
+def test_plan_pins_process_encoder():
+    plan = label_qr_pdf.plan_qr_batch(["HALI:a"])
+    assert plan.encoder == label_qr_pdf.qr_encoder_name()
+    assert plan.encoder in available_qr_encoders()
+
+
+def test_auto_encoder_is_fixed_and_shared_by_threads(monkeypatch):
+    # "auto" follows the preference list, never a timing, and concurrent first jobs agree.
+    import threading
+
+    def no_benchmark(*args, **kwargs):
+        raise AssertionError("auto must not benchmark")
+
+    monkeypatch.setattr(label_qr_pdf, "benchmark_qr_encoders", no_benchmark)
+    monkeypatch.setattr(label_qr_pdf, "_QR_ENCODER", None)
+    expected = next(n for n in label_qr_pdf._QR_ENCODER_PREFERENCE if n in available_qr_encoders())
+    start = threading.Barrier(8)
+    seen: List[str] = []
+
+    def first_job():
+        start.wait()
+        seen.append(label_qr_pdf.plan_qr_batch(["HALI:a"]).encoder)
+
+    threads = [threading.Thread(target=first_job) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert seen == [expected] * 8
+    assert label_qr_pdf.set_qr_encoder("auto") == expected
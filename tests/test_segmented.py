@@ -0,0 +1,63 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from label_qr_pdf import LabelRow, generate_labels_pdf, generate_qr_list_pdf
+
+pymupdf = pytest.importorskip("pymupdf")
+
+
+def _rows():
+    return [
+        LabelRow(
+            cins="HALI" if i % 2 else "KİLİM",
+            carpet_name=f"ŞÖNİL ÇİÇEKLİ ürün {i}",
+            qr_text=f"HALI:urun-{i}" + "-x" * (i % 9),
+            quantity=1 + (i % 4 == 0) * 2,
+        )
+        for i in range(37)
+    ]
+
+
+@pytest.fixture
+def logo(tmp_path):
+    path = str(tmp_path / "logo.png")
+    img = Image.new("RGBA", (64, 64), (255, 255, 255, 0))
+    for x in range(8, 56):
+        for y in range(8, 56):
+            img.putpixel((x, y), (200, 30, 30, 255) if (x // 8 + y // 8) % 2 else (20, 20, 20, 255))
+    img.save(path)
+    return path
+
+
+def _pages(data: bytes):
+    # Page count and the rendered pixels of every page.
+    with pymupdf.open(stream=data, filetype="pdf") as doc:
+        return [page.get_pixmap(dpi=72).samples for page in doc]
+
+
+@pytest.mark.parametrize("kind", ["labels", "list"])
+@pytest.mark.parametrize("compact_images", [False, True])
+@pytest.mark.parametrize("with_logo", [False, True])
+@pytest.mark.parametrize("segment_pages", [1, 7])
+@pytest.mark.parametrize("source", [list, iter])
+def test_segmented_output_matches_single_document(
+    ttf_font, logo, kind, compact_images, with_logo, segment_pages, source
+):
+    # Both runs get the same kind of input: a list pins one QR version up front, an iterator
+    # keeps the per-label fit search.
+    render = generate_qr_list_pdf if kind == "list" else generate_labels_pdf
+    options = {"compact_images": compact_images, "logo_path": logo if with_logo else None}
+    whole, segmented = BytesIO(), BytesIO()
+    render(source(_rows()), whole, **options)
+    render(source(_rows()), segmented, segment_pages=segment_pages, **options)
+
+    expected = _pages(whole.getvalue())
+    got = _pages(segmented.getvalue())
+    if kind == "labels":
+        # One page per copy; a segment boundary may split the copies of a row.
+        assert len(expected) == sum(r.quantity for r in _rows())
+    assert len(got) == len(expected)
+    for i, (a, b) in enumerate(zip(expected, got)):
+        assert a == b, f"sayfa {i + 1} farklı"
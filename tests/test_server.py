@@ -0,0 +1,43 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from label_server import RenderService, make_server
+
+
+@pytest.fixture(scope="module")
+def port():
+    service = RenderService(workers=1, max_queue=2)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def _post(port, path, body):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    conn.request("POST", path, body=body, headers={"Content-Type": "text/plain"})
+    resp = conn.getresponse()
+    return resp.status, resp.getheader("Transfer-Encoding"), resp.read()
+
+
+BODY = "\n".join(f"HALI:urun-{i}" for i in range(30)).encode("utf-8")
+
+
+@pytest.mark.parametrize("query", ["", "?segment_pages=7"])
+def test_pdf_is_streamed_in_chunks(port, query):
+    status, encoding, data = _post(port, "/labels" + query, BODY)
+    assert status == 200
+    assert encoding == "chunked"
+    assert data.startswith(b"%PDF-") and data.rstrip().endswith(b"%%EOF")
+
+
+@pytest.mark.parametrize("path", ["/list?cols=0", "/list?rows=-1", "/labels?width_mm=0", "/labels?qr_mm=abc"])
+def test_bad_layout_options_are_client_errors(port, path):
+    status, _, data = _post(port, path, BODY)
+    assert status == 400
+    assert "error" in json.loads(data)